@@ -1,4 +1,5 @@
 # pylint: disable=line-too-long, function-name-too-long
+import threading
 import time
 import requests
 import json
@@ -27,8 +28,21 @@ class RemoteInstance:
         self.remote_port = remote_port
         self.base_url = f"http://{remote_ip}:{remote_port}"
         self.device = None
+        # 每个线程各自复用一个 Session，保持 keep-alive 连接，避免每条 ADB 命令都重新建立 TCP 连接
+        self._local = threading.local()
         self.initialize_worker(config)
 
+    @property
+    def http_session(self):
+        """
+        当前线程的 requests.Session
+        controller 的线程池等会从多个线程并发发请求，而 requests.Session 不保证线程安全，所以不在线程间共享
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
     def initialize_worker(self, config):
         """
         初始化工作器，设置配置
@@ -268,7 +282,7 @@ class RemoteInstance:
         attempts = 0
         while attempts < max_attempts:
             try:
-                response = requests.post(url, headers=headers, data=json.dumps(data), timeout=timeout)
+                response = self.http_session.post(url, headers=headers, data=json.dumps(data), timeout=timeout)
                 return response.json()
             except Exception as e:
                 print_with_color(f"Error occurred while sending request to {url}: {e}", "red")
@@ -6,7 +6,8 @@ import asyncio
 from rich import print
 from datetime import datetime
 from openai import AsyncOpenAI
-from svagent.templates.verifier_prompt import SYSTEM_PROMPT_VERIFIER
+from svagent.templates.verifier_prompt import build_verifier_prompt
+from svagent.utils_mobile.verifier_cache import VerifierCache
 from svagent.mobile_tool_agent_loop import ToolAgentLoop
 from typing import Tuple, List
 import numpy as np
@@ -343,13 +344,18 @@ def compute_score(data_source, solution_str, ground_truth, extra_info=None, **kw
         return res
 
     # 构建验证消息
-    messages = [{'role': 'user', 'content': SYSTEM_PROMPT_VERIFIER + f"\n## Task Description\n{task_instruction}\n\n## Agent's Final Claim\n{parsed_info['submit_message'] or 'No message provided'}"}]
+    messages = [{'role': 'user', 'content': build_verifier_prompt(task_instruction, parsed_info['submit_message'] or 'No message provided')}]
     
-    # 添加evidence到消息中
-    for idx in parsed_info['submit_evidences']:
+    # 添加evidence到消息中；内容完全相同的证据（界面没变化）只发送一次，后面的只引用前一轮
+    first_round_of = {}
+    for idx in dict.fromkeys(parsed_info['submit_evidences']):
         if 0 <= idx < len(parsed_info['evidences']):
             evidence_content = parsed_info['evidences'][idx]
-            messages.append({'role': 'user', 'content': f"** Round {idx} XML Evidence **\n{evidence_content}"})
+            first_idx = first_round_of.setdefault(evidence_content, idx)
+            if first_idx == idx:
+                messages.append({'role': 'user', 'content': f"** Round {idx} XML Evidence **\n{evidence_content}"})
+            else:
+                messages.append({'role': 'user', 'content': f"** Round {idx} XML Evidence **\nIdentical to Round {first_idx} XML Evidence."})
     
     # model_name="qwen3-235b-a22b"
     model_name = os.environ.get("MODEL_NAME", "DeepSeek-V3.1")
@@ -375,8 +381,21 @@ def compute_score(data_source, solution_str, ground_truth, extra_info=None, **kw
                 tasks.append(task)
             return await asyncio.gather(*tasks, return_exceptions=True)
     
-    # 运行并行测试
-    results = asyncio.run(run_parallel_tests())
+    # 运行并行测试；设置了 VERIFIER_CACHE_PATH 时，完全相同的验证请求直接复用缓存结果
+    verifier_cache = None
+    cache_key = None
+    cached_results = None
+    if os.environ.get("VERIFIER_CACHE_PATH"):
+        verifier_cache = VerifierCache(os.environ["VERIFIER_CACHE_PATH"])
+        cache_key = VerifierCache.make_key(model_name, messages)
+        cached_results = verifier_cache.get(cache_key)
+    if cached_results is not None:
+        print(f"[green]验证结果命中缓存: {cache_key}[/green]")
+        results = cached_results
+    else:
+        results = asyncio.run(run_parallel_tests())
+        if verifier_cache is not None and not any(isinstance(result, Exception) for result in results):
+            verifier_cache.put(cache_key, model_name, results)
     
     # 保存验证结果
     success_count, valid_evidence_count, verification_results_dir = save_verification_results(
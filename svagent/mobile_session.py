@@ -729,6 +729,10 @@ class MobileSession:
             # except Exception as e:
             #     print(f"Warning: Error stopping device: {e}")
             
+            # 关闭 controller 的线程池
+            if self._controller is not None:
+                self._controller.close()
+
             # 释放docker实例
             self._release_docker_instance()
             pass
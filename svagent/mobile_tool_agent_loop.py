@@ -20,18 +20,77 @@ import copy
 import numpy as np
 from typing import Any
 from uuid import uuid4
-import time
 from verl.experimental.agent_loop.agent_loop import AgentLoopBase, AgentLoopOutput, register
 from verl.experimental.agent_loop.tool_parser import FunctionCall, ToolParser
 from verl.tools.utils.tool_registry import initialize_tools_from_config
 from verl.utils.profiler import simple_timer
 from verl.utils.rollout_trace import rollout_trace_op
 from .mobile_session import MobileSession
+from .utils_mobile.control_tool_verl import DefaultTool
 
 logger = logging.getLogger(__file__)
 logger.setLevel(os.getenv("VERL_LOGGING_LEVEL", "WARN"))
 
 
+class ToolError(Exception):
+    """Returned by `_call_tool` in place of a tool message when the tool raised."""
+    __slots__ = ("orig",)
+
+    def __init__(self, orig: BaseException):
+        super().__init__(orig)
+        self.orig = orig
+
+
+_TRUNCATED_TAIL = "...(truncated)"
+_TRUNCATED_HEAD = "(truncated)..."
+_TRUNCATED_MIDDLE = "...(truncated)..."
+
+
+def _truncate_tool_response(tool_response: str, side: str, limit: int, half: int) -> str:
+    """Truncate a tool response longer than `limit` characters, keeping the `side` end."""
+    if len(tool_response) <= limit:
+        return tool_response
+    if side == "left":
+        return tool_response[:limit] + _TRUNCATED_TAIL
+    if side == "right":
+        return _TRUNCATED_HEAD + tool_response[-limit:]
+    return tool_response[:half] + _TRUNCATED_MIDDLE + tool_response[-half:]
+
+
+def _create_docker_manager():
+    """Create the docker manager selected by the DOCKER_MANAGER_TYPE environment variable."""
+    docker_manager_type = os.getenv("DOCKER_MANAGER_TYPE", "tione")  # Default to Tione
+    logger.info(f"[DEBUG] Using docker manager type: {docker_manager_type}")
+
+    if docker_manager_type.lower() == "advanced":
+        # Use legacy Docker Scheduler manager
+        assert "DOCKER_SCHEDULER_URL" in os.environ, "Environment variable DOCKER_SCHEDULER_URL must be set when using legacy manager"
+        docker_scheduler_url = os.getenv("DOCKER_SCHEDULER_URL")
+        logger.info(f"[DEBUG] Creating AdvancedDockerManager with URL: {docker_scheduler_url}")
+        from .mobile_session import AdvancedDockerManager
+        return AdvancedDockerManager(scheduler_url=docker_scheduler_url)
+
+    # Use Tione Docker manager (default)
+    from .mobile_session import TioneDockerManager
+    env_type = os.getenv("TIONE_ENV_TYPE", "OS")  # Default environment type
+    logger.info(f"[DEBUG] Creating TioneDockerManager with env_type: {env_type}")
+    return TioneDockerManager(env_type=env_type)
+
+
+def _create_mobile_session(task_config, mobile_config, save_dir: str) -> MobileSession:
+    """Blocking MobileSession setup, meant to run in an executor thread.
+
+    Each session gets its own docker manager since managers track the instance they allocated.
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    return MobileSession(
+        task_dict=task_config,
+        config=mobile_config,
+        docker_manager=_create_docker_manager(),
+        save_dir=save_dir
+    )
+
+
 @register("mobile_tool_agent")
 class ToolAgentLoop(AgentLoopBase):
     @classmethod
@@ -48,6 +107,7 @@ class ToolAgentLoop(AgentLoopBase):
         cls.max_parallel_calls = config.actor_rollout_ref.rollout.multi_turn.max_parallel_calls
         cls.max_tool_response_length = config.actor_rollout_ref.rollout.multi_turn.max_tool_response_length
         cls.tool_response_truncate_side = config.actor_rollout_ref.rollout.multi_turn.tool_response_truncate_side
+        cls._half_max_tool_response_length = cls.max_tool_response_length // 2
         tool_config_path = config.actor_rollout_ref.rollout.multi_turn.tool_config_path
         try:
             tool_list = initialize_tools_from_config(tool_config_path) if tool_config_path else []
@@ -74,6 +134,8 @@ class ToolAgentLoop(AgentLoopBase):
             system_prompt = system_prompt[:system_prompt.rfind(tokenizer.eos_token)+len(tokenizer.eos_token)]
             system_prompt_tkid = tokenizer.encode(system_prompt, add_special_tokens=False)
             cls.system_prompt = system_prompt_tkid
+        # Tool responses are re-templated every turn; strip the default system prompt by its cached length
+        cls._system_prompt_len = len(cls.system_prompt)
         print(f"Sytem prompt for the tokenizer\n>>>>>> start of the system prompt <<<<<<\n\n{cls.system_prompt}\n\n>>>>>> end of the system prompt <<<<<<")
 
     @rollout_trace_op
@@ -81,18 +143,17 @@ class ToolAgentLoop(AgentLoopBase):
         metrics = {}
         request_id = uuid4().hex
         assert(len(self.tool_schemas) > 0)
-        prompt_ids = await self.loop.run_in_executor(
-            None,
-            lambda: self.tokenizer.apply_chat_template(
-                messages, tools=self.tool_schemas, add_generation_prompt=True, tokenize=True
-            ),
-        )
+        # Render the chat template (and serialize the tool schemas) only once, then encode the text.
         prompt_text = await self.loop.run_in_executor(
             None,
             lambda: self.tokenizer.apply_chat_template(
                 messages, tools=self.tool_schemas, add_generation_prompt=True, tokenize=False
             ),
         )
+        prompt_ids = await self.loop.run_in_executor(
+            None,
+            lambda: self.tokenizer.encode(prompt_text, add_special_tokens=False),
+        )
         print(f">>>🐳 {prompt_text=}")
         response_mask = []
         step = kwargs.get("step", None)
@@ -135,33 +196,10 @@ class ToolAgentLoop(AgentLoopBase):
             save_dir = os.path.join(save_dir, f"step_{step}")
         # if sample_index and rollout_n:
         #     save_dir = os.path.join(save_dir, f"sample_index_{sample_index}_rollout_n_{rollout_n}")
-        os.makedirs(save_dir, exist_ok=True)
-        # Create Docker manager based on environment configuration
-        docker_manager_type = os.getenv("DOCKER_MANAGER_TYPE", "tione")  # Default to Tione
-        logger.info(f"[DEBUG] Using docker manager type: {docker_manager_type}")
-        
-        if docker_manager_type.lower() == "advanced":
-            # Use legacy Docker Scheduler manager
-            assert "DOCKER_SCHEDULER_URL" in os.environ, "Environment variable DOCKER_SCHEDULER_URL must be set when using legacy manager"
-            docker_scheduler_url = os.getenv("DOCKER_SCHEDULER_URL")
-            logger.info(f"[DEBUG] Creating AdvancedDockerManager with URL: {docker_scheduler_url}")
-            from .mobile_session import AdvancedDockerManager
-            docker_manager = AdvancedDockerManager(scheduler_url=docker_scheduler_url)
-        else:
-            # Use Tione Docker manager (default)
-            from .mobile_session import TioneDockerManager
-            env_type = os.getenv("TIONE_ENV_TYPE", "OS")  # Default environment type
-            logger.info(f"[DEBUG] Creating TioneDockerManager with env_type: {env_type}")
-            docker_manager = TioneDockerManager(env_type=env_type)
-
-        mobile_session = await asyncio.get_running_loop().run_in_executor(
+        # Directory creation, docker manager construction and session setup all block, keep them off the event loop
+        mobile_session = await self.loop.run_in_executor(
             None,
-            lambda: MobileSession(
-                task_dict=task_config, 
-                config=mobile_config, 
-                docker_manager=docker_manager, 
-                save_dir=save_dir
-            )
+            lambda: _create_mobile_session(task_config, mobile_config, save_dir)
         )
         if ("map.me" in app_name_mobile) or ("maps.me" in app_name_mobile) or ("pimusic" in app_name_mobile) or \
             ("map.me" in app_name_task) or ("maps.me" in app_name_task) or ("pimusic" in app_name_task):
@@ -172,7 +210,7 @@ class ToolAgentLoop(AgentLoopBase):
             mobile_session=mobile_session,
             accessibility=accessibility,
         )
-        time.sleep(5)
+        await asyncio.sleep(5)
         user_turns, assistant_turns = 0, 0
         task_done = False
         messages_full = {"tools": self.tool_schemas, "messages": copy.deepcopy(messages)}
@@ -201,18 +239,25 @@ class ToolAgentLoop(AgentLoopBase):
             # no tool calls
             assistant_content, tool_calls = await self.tool_parser.extract_tool_calls(response_ids)
             messages_full["messages"].append(
-                {"role": "assistant", "content": copy.deepcopy(assistant_content), "tool_calls": copy.deepcopy(tool_calls)}
+                {"role": "assistant", "content": assistant_content, "tool_calls": tool_calls}
             )
             if not tool_calls:
                 break
 
             # call tools
             tasks = []
+            submit_seen = False
             for tool_call in tool_calls[: self.max_parallel_calls]:
+                submit_seen |= tool_call.name == "submit"
                 tasks.append(self._call_tool(tool_call, create_kwargs=create_kwargs, assistant_turns_index=assistant_turns-1))
             with simple_timer("tool_calls", metrics):
                 tool_responses = await asyncio.gather(*tasks)
-            if any(isinstance(item, Exception) for item in tool_responses):
+            tool_failed = False
+            for item in tool_responses:
+                if type(item) is ToolError:
+                    tool_failed = True
+                    break
+            if tool_failed:
                 break
             messages_full["messages"] += tool_responses
             # append tool_response_ids
@@ -222,7 +267,7 @@ class ToolAgentLoop(AgentLoopBase):
                     messages, add_generation_prompt=True, tokenize=True
                 ),
             )
-            tool_response_ids = tool_response_ids[len(self.system_prompt) :]
+            tool_response_ids = tool_response_ids[self._system_prompt_len :]
             # NOTE: last turn should not be user turn, or the EOS token reward
             # can't be propagated to previous token in GAE.
             if len(response_mask) + len(tool_response_ids) >= self.response_length:
@@ -232,20 +277,19 @@ class ToolAgentLoop(AgentLoopBase):
             response_mask += [0] * len(tool_response_ids)
             user_turns += 1
             # 判断是否出现了submit调用 从而简化流程
-            for tool_call in tool_calls:
-                if tool_call.name == "submit":
-                    task_done = True
-                    break
-
-            if task_done:
+            if submit_seen:
+                task_done = True
                 break
 
-        response_ids = prompt_ids[-len(response_mask) :]
-        prompt_ids = prompt_ids[: len(prompt_ids) - len(response_mask)]
+        # Slice the prompt/response split and the response_length truncation in one pass
+        prompt_end = len(prompt_ids) - len(response_mask)
+        response_end = prompt_end + min(len(response_mask), self.response_length)
+        # fast_mode 下最后一个动作的等待和采集可能还在后台执行，先等它写完轨迹再释放设备
+        await DefaultTool.settle_session(mobile_session)
         mobile_session._release_docker_instance()
         output = AgentLoopOutput(
-            prompt_ids=prompt_ids,
-            response_ids=response_ids[: self.response_length],
+            prompt_ids=prompt_ids[:prompt_end],
+            response_ids=prompt_ids[prompt_end:response_end],
             response_mask=response_mask[: self.response_length],
             num_turns=user_turns + assistant_turns + 1,
             metrics=metrics,
@@ -265,20 +309,16 @@ class ToolAgentLoop(AgentLoopBase):
             instance_id = await tool.create(create_kwargs=create_kwargs)
             tool_response, _, _ = await tool.execute(instance_id, arguments)
         except Exception as e:
-            logger.exception(f"Error when executing tool: {e}")
-            return e
+            if logger.isEnabledFor(logging.ERROR):
+                logger.exception("Error when executing tool: %s", e)
+            return ToolError(e)
         finally:
             if tool and instance_id:
                 await tool.release(instance_id)
 
-        if len(tool_response) > self.max_tool_response_length:
-            if self.tool_response_truncate_side == "left":
-                tool_response = tool_response[: self.max_tool_response_length] + "...(truncated)"
-            elif self.tool_response_truncate_side == "right":
-                tool_response = "(truncated)..." + tool_response[-self.max_tool_response_length :]
-            else:
-                length = self.max_tool_response_length // 2
-                tool_response = tool_response[:length] + "...(truncated)..." + tool_response[-length:]
+        tool_response = _truncate_tool_response(
+            tool_response, self.tool_response_truncate_side, self.max_tool_response_length, self._half_max_tool_response_length
+        )
         tool_response_round = f"## Round {assistant_turns_index}\n{tool_response}"
         tool_response_start_tag = "<observation>\n"
         tool_response_end_tag = "\n</observation>"
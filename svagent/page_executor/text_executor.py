@@ -1,23 +1,154 @@
 # pylint: disable=line-too-long, function-name-too-long
 
+import ast
 import inspect
+import itertools
 import json
+import math
 import re
 import time
 import os
-import glob
-from functools import partial
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from ..templates.packages import find_package
 from .utils import call_dino, plot_bbox, get_center_width_height
 
 
+DEJAVU_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+_LEADING_ZERO_RE = re.compile(r'\b0+(\d)')
+
+
+@lru_cache(maxsize=8)
+def _load_font(path, size):
+    """加载字体并缓存，避免每帧重复解析 TTF 文件"""
+    try:
+        # 尝试使用系统字体
+        return ImageFont.truetype(path, size)
+    except (OSError, ImportError):
+        # 如果系统字体不可用，使用默认字体
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=512)
+def _wrap_text_cached(text, font, max_width):
+    """
+    文本自动换行函数，按 (text, font, max_width) 缓存，同一指令在每一帧只需排版一次
+    """
+    if not text:
+        return ()
+    words = text.split(' ')
+    # 每个单词只测量一次宽度，cum[i] 为前 i 个单词（各带一个空格）的累计宽度
+    space_width = font.getlength(" ")
+    cum = [0.0]
+    for word in words:
+        cum.append(cum[-1] + font.getlength(word) + space_width)
+
+    lines = []
+    start = 0
+    while start < len(words):
+        # 二分查找能放进 max_width 的最长单词序列 words[start:end]
+        end = bisect_right(cum, cum[start] + space_width + max_width, lo=start + 1) - 1
+        if end == start:
+            # 如果单个单词就超过最大宽度，强制换行
+            end = start + 1
+        lines.append(" ".join(words[start:end]))
+        start = end
+
+    return tuple(lines)
+
+
+# 匹配 "Action: do(...)" / "finish(...)" / "self.do(...)" 这类单个方法调用
+_ACTION_CALL_RE = re.compile(r'^(?:Action:\s*)?(?:self\.)?([A-Za-z_]\w*)\((.*)\)$', re.S)
+
+
+def _parse_action_call(code):
+    """
+    将动作代码解析为 (方法名, 位置参数, 关键字参数)，参数只接受字面量；无法解析时返回 None
+    """
+    match = _ACTION_CALL_RE.match(code)
+    if match is None:
+        return None
+    name, arg_text = match.groups()
+    try:
+        call = ast.parse(f"_({arg_text})", mode="eval").body
+        if not isinstance(call, ast.Call):
+            return None
+        args = [ast.literal_eval(arg) for arg in call.args]
+        kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+    except (SyntaxError, ValueError, TypeError):
+        return None
+    if None in kwargs:
+        # **kwargs 展开不是字面量调用
+        return None
+    return name, args, kwargs
+
+
+@lru_cache(maxsize=512)
+def _text_block_metrics(lines, font):
+    """
+    计算多行文本的行高、最大行宽和 multiline_text 所需的 spacing 并缓存，同一段文本在每一帧只测量一次
+    """
+    bbox_a = font.getbbox("A")
+    line_height = bbox_a[3] - bbox_a[1] + 5  # 行高加上行间距
+    # multiline_text 的行距是 "A" 的 bbox 底边加 spacing，换算成与 line_height 一致
+    spacing = line_height - bbox_a[3]
+
+    # 计算最大行宽
+    max_line_width = 0
+    for line in lines:
+        bbox = font.getbbox(line)
+        max_line_width = max(max_line_width, bbox[2] - bbox[0])
+    return line_height, max_line_width, spacing
+
+
+@lru_cache(maxsize=8)
+def _frame_label_metrics(font):
+    """
+    测量 "Frame " 前缀和 0-9 各数字的宽度以及标签高度，帧编号的宽度用它们相加得到
+    """
+    prefix_width = font.getlength("Frame ")
+    digit_widths = tuple(font.getlength(str(d)) for d in range(10))
+    bbox = font.getbbox("Frame 0")
+    return prefix_width, digit_widths, bbox[3] - bbox[1]
+
+
+@lru_cache(maxsize=8)
+def _frame_label_glyphs(font):
+    """
+    把 "Frame " 前缀和 0-9 各数字预先渲染成灰度蒙版，帧编号按宽度依次粘贴即可
+    """
+    def render(text):
+        bbox = font.getbbox(text)
+        mask = Image.new("L", (max(bbox[2], math.ceil(font.getlength(text))), bbox[3]))
+        ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+        return mask
+
+    return render("Frame "), tuple(render(str(d)) for d in range(10))
+
+
 def remove_leading_zeros_in_string(s):
     # 使用正则表达式匹配列表中的每个数值并去除前导零
-    return re.sub(r'\b0+(\d)', r'\1', s)
+    return _LEADING_ZERO_RE.sub(r'\1', s)
 
 
 class TextOnlyExecutor:
+    # 动作名 -> (方法名, 是否传 element, 是否传 kwargs)，类定义时构建一次
+    _ACTIONS = {
+        "Tap": ("tap", True, False),
+        "Type": ("type", False, True),
+        "Swipe": ("swipe", True, True),
+        "Enter": ("press_enter", False, False),
+        "Home": ("press_home", False, False),
+        "Back": ("press_back", False, False),
+        "Long Press": ("long_press", True, False),
+        "Wait": ("wait", False, False),
+        "Launch": ("launch", False, True),
+        "Call_API": ("call_api", False, True),
+    }
+
     def __init__(self, controller, config):
         self.config = config
         self.controller = controller
@@ -27,6 +158,9 @@ class TextOnlyExecutor:
 
         self.new_page_captured = False
         self.current_screenshot = None
+        self._shot_idx = 0  # 截图序号，用于文件名
+        self._captured = []  # 已保存的截图路径，按拍摄顺序
+        self._bbox_scale = None  # (viewport_size, x 缩放, y 缩放)
         self.current_return = None
 
         self.last_turn_element = None
@@ -37,6 +171,8 @@ class TextOnlyExecutor:
         
         self.finish_message = None
         self.submit_evidences = None
+        # 方法名在类上只反射一次，这里直接取绑定方法
+        self._methods = {name: getattr(self, name) for name in self._method_names()}
         # self.glm4_key = config.glm4_key
 
         # self.device_pixel_ratio = self.page.evaluate("window.devicePixelRatio")
@@ -50,11 +186,16 @@ class TextOnlyExecutor:
         return json.dumps(status, ensure_ascii=False)
 
     def modify_relative_bbox(self, relative_bbox):
-        viewport_width, viewport_height = self.controller.viewport_size
-        modify_x1 = relative_bbox[0] * viewport_width / 1000
-        modify_y1 = relative_bbox[1] * viewport_height / 1000
-        modify_x2 = relative_bbox[2] * viewport_width / 1000
-        modify_y2 = relative_bbox[3] * viewport_height / 1000
+        viewport_size = self.controller.viewport_size
+        # 缩放系数按 viewport_size 缓存，屏幕尺寸变化（换了新的 tuple）时重新计算
+        if self._bbox_scale is None or self._bbox_scale[0] is not viewport_size:
+            viewport_width, viewport_height = viewport_size
+            self._bbox_scale = (viewport_size, viewport_width / 1000, viewport_height / 1000)
+        _, scale_x, scale_y = self._bbox_scale
+        modify_x1 = relative_bbox[0] * scale_x
+        modify_y1 = relative_bbox[1] * scale_y
+        modify_x2 = relative_bbox[2] * scale_x
+        modify_y2 = relative_bbox[3] * scale_y
         return [modify_x1, modify_y1, modify_x2, modify_y2]
 
     def __call__(self, code_snippet):
@@ -63,8 +204,6 @@ class TextOnlyExecutor:
         self.controller.on("page", self.__capture_new_page__)
         self.current_return = None'''
 
-        local_context = self.__get_class_methods__()
-        local_context.update(**{'self': self})
         print(code_snippet.strip())
         if len(code_snippet.split("\n")) > 1:
             for code in code_snippet.split("\n"):
@@ -73,9 +212,29 @@ class TextOnlyExecutor:
                     break
 
         code = remove_leading_zeros_in_string(code_snippet.strip())
-        exec(code, {}, local_context)
+        parsed = _parse_action_call(code)
+        if parsed is not None and parsed[0] in self._methods:
+            # 常见的单个动作调用直接分发，不再 compile + exec
+            name, args, kwargs = parsed
+            self._methods[name](*args, **kwargs)
+        else:
+            local_context = dict(self._methods)
+            local_context['self'] = self
+            exec(code, {}, local_context)
         return self.current_return
 
+    @classmethod
+    def _method_names(cls):
+        """
+        返回本类自身定义的非 dunder 方法名，结果缓存在类上
+        """
+        if '_cached_method_names' not in cls.__dict__:
+            cls._cached_method_names = tuple(
+                name for name, method in inspect.getmembers(cls, predicate=inspect.isfunction)
+                if not name.startswith('__') and method.__qualname__.split('.')[0] == cls.__name__
+            )
+        return cls._cached_method_names
+
     def __get_class_methods__(self, include_dunder=False, exclude_inherited=True):
         """
         Returns a dictionary of {method_name: method_object} for all methods in the given class.
@@ -92,67 +251,33 @@ class TextOnlyExecutor:
                 continue
             if not include_dunder and name.startswith('__'):
                 continue
-            methods_dict[name] = partial(method, self)
+            methods_dict[name] = getattr(self, name)
         return methods_dict
 
     def update_screenshot(self, prefix=None, suffix=None):
         # time.sleep(2)
-        if prefix is None and suffix is None:
-            self.current_screenshot = f"{self.screenshot_dir}/screenshot-{time.time()}.png"
-        elif prefix is not None and suffix is None:
-            self.current_screenshot = f"{self.screenshot_dir}/screenshot-{prefix}-{time.time()}.png"
-        elif prefix is None and suffix is not None:
-            self.current_screenshot = f"{self.screenshot_dir}/screenshot-{time.time()}-{suffix}.png"
-        else:
-            self.current_screenshot = f"{self.screenshot_dir}/screenshot-{prefix}-{time.time()}-{suffix}.png"
+        # 序号放在最前面，按文件名排序即为截图顺序
+        self._shot_idx += 1
+        prefix_part = "" if prefix is None else f"-{prefix}"
+        suffix_part = "" if suffix is None else f"-{suffix}"
+        self.current_screenshot = f"{self.screenshot_dir}/screenshot-{self._shot_idx:06d}{prefix_part}{suffix_part}.png"
         self.controller.save_screenshot(self.current_screenshot)
+        self._captured.append(self.current_screenshot)
 
     def _wrap_text(self, text, font, max_width):
         """
         文本自动换行函数
         """
-        lines = []
-        words = text.split(' ')
-        current_line = ""
-        
-        for word in words:
-            # 测试当前行加上新单词的宽度
-            test_line = current_line + (" " if current_line else "") + word
-            bbox = font.getbbox(test_line)
-            test_width = bbox[2] - bbox[0]
-            
-            if test_width <= max_width:
-                current_line = test_line
-            else:
-                # 如果当前行不为空，将其添加到结果中
-                if current_line:
-                    lines.append(current_line)
-                    current_line = word
-                else:
-                    # 如果单个单词就超过最大宽度，强制换行
-                    lines.append(word)
-        
-        # 添加最后一行
-        if current_line:
-            lines.append(current_line)
-        
-        return lines
+        return _wrap_text_cached(text, font, max_width)
 
     def _draw_multiline_text(self, draw, text, font, max_width, start_x, start_y, fill_color, bg_color=None, padding=10):
         """
         绘制多行文本
         """
         lines = self._wrap_text(text, font, max_width)
-        line_height = font.getbbox("A")[3] - font.getbbox("A")[1] + 5  # 行高加上行间距
+        line_height, max_line_width, spacing = _text_block_metrics(lines, font)
         total_height = len(lines) * line_height
         
-        # 计算最大行宽
-        max_line_width = 0
-        for line in lines:
-            bbox = font.getbbox(line)
-            line_width = bbox[2] - bbox[0]
-            max_line_width = max(max_line_width, line_width)
-        
         # 绘制背景
         if bg_color:
             bg_box = [
@@ -163,10 +288,8 @@ class TextOnlyExecutor:
             ]
             draw.rectangle(bg_box, fill=bg_color)
         
-        # 绘制每一行文本
-        for i, line in enumerate(lines):
-            y_pos = start_y + i * line_height
-            draw.text((start_x, y_pos), line, fill=fill_color, font=font)
+        # 一次绘制所有行
+        draw.multiline_text((start_x, start_y), "\n".join(lines), fill=fill_color, font=font, spacing=spacing)
         
         return max_line_width, total_height
 
@@ -176,104 +299,143 @@ class TextOnlyExecutor:
         """
         finish_message = self.finish_message
         try:
-            # 获取所有截图文件
-            screenshot_pattern = os.path.join(self.screenshot_dir, "screenshot-*.png")
-            screenshot_files = glob.glob(screenshot_pattern)
-            
-            if len(screenshot_files) < 3:
+            # 截图在 update_screenshot 中按顺序登记，无需再扫描目录
+            if len(self._captured) < 3:
                 print("截图文件数量不足，无法生成GIF")
                 return None
             
-            # 按文件名中的时间戳排序
-            screenshot_files.sort(key=lambda x: os.path.getctime(x))
-            screenshot_files = screenshot_files[1:]
-            
-            # 打开所有图片并添加帧编号
-            images = []
-            durations = []  # 存储每帧的持续时间
+            screenshot_files = self._captured[1:]
             
-            for i, file_path in enumerate(screenshot_files, 1):
+            # 先缩小帧再标注和编码，调色板量化的开销随像素数下降
+            gif_max_width = self.config.get('gif_max_width', 720)
+
+            instruction_text = f"Task: {task_instruction}"
+            durations = []  # 存储每帧的持续时间，随帧生成逐个追加，编码器按帧序读取
+            master_palette = None  # 所有帧共用的调色板，由第一帧量化得到
+
+            # 单帧的打开、缩放、标注和量化，可在线程池中执行（PIL 的 C 实现会释放 GIL）
+            def annotate_frame(i, file_path):
+                nonlocal master_palette
                 try:
-                    img = Image.open(file_path)
-                    # 转换为RGB模式以确保兼容性
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    # 在图片上添加帧编号
-                    draw = ImageDraw.Draw(img)
+                    # with 块结束即释放文件句柄和原始解码缓冲，annotate 后的帧是量化出的新图像
+                    with Image.open(file_path) as img:
+                        # 按最大宽度等比缩小，字号随缩放比例调整（_load_font 有缓存，同尺寸只加载一次）
+                        scale = min(1.0, gif_max_width / img.width)
+                        if scale < 1.0:
+                            img.thumbnail((gif_max_width, gif_max_width * 10), Image.Resampling.LANCZOS)
+
+                        # 转换为RGB模式以确保兼容性；放在缩小之后，只需转换缩小后的像素
+                        if img.mode != 'RGB':
+                            img = img.convert('RGB')
+                        font = _load_font(DEJAVU_FONT_PATH, max(1, round(40 * scale)))
+                        finish_font = _load_font(DEJAVU_FONT_PATH, max(1, round(50 * scale)))
+                
+                        # 在图片上添加帧编号
+                        draw = ImageDraw.Draw(img)
+                
+                        # 获取文本大小：由预先测量的前缀和数字宽度相加，不再逐帧排版
+                        prefix_width, digit_widths, text_height = _frame_label_metrics(font)
+                        text_width = prefix_width + sum(digit_widths[int(c)] for c in str(i))
+                
+                        # 在图片右上角添加帧编号
+                        x = img.width - text_width - 20
+                        y = 20
+                
+                        # 添加半透明背景
+                        background_box = [x-10, y-5, x+text_width+10, y+text_height+5]
+                        draw.rectangle(background_box, fill=(0, 0, 0, 128))
+                
+                        # 添加白色文本：逐个贴上预先渲染好的前缀和数字字形，不再逐帧光栅化
+                        prefix_mask, digit_masks = _frame_label_glyphs(font)
+                        img.paste((255, 255, 255), (round(x), y), prefix_mask)
+                        glyph_x = x + prefix_width
+                        for c in str(i):
+                            img.paste((255, 255, 255), (round(glyph_x), y), digit_masks[int(c)])
+                            glyph_x += digit_widths[int(c)]
+                
+                        # 在每一帧的页面上部绘制任务指令
+                        if task_instruction:
+                            # 计算可用宽度（图片宽度的85%）
+                            max_instruction_width = int(img.width * 0.85)
                     
-                    # 设置文本样式
-                    frame_text = f"Frame {i}"
-                    try:
-                        # 尝试使用系统字体
-                        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 40)
-                        finish_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 50)
-                    except:
-                        # 如果系统字体不可用，使用默认字体
-                        font = ImageFont.load_default()
-                        finish_font = ImageFont.load_default()
+                            # 使用多行文本绘制函数绘制任务指令
+                            instruction_x = (img.width - max_instruction_width) // 2
+                            instruction_y = 20  # 从顶部向下20像素开始
                     
-                    # 获取文本大小
-                    text_bbox = draw.textbbox((0, 0), frame_text, font=font)
-                    text_width = text_bbox[2] - text_bbox[0]
-                    text_height = text_bbox[3] - text_bbox[1]
+                            self._draw_multiline_text(
+                                draw, instruction_text, finish_font, max_instruction_width,
+                                instruction_x, instruction_y, (255, 255, 255), (0, 0, 0, 180), 20
+                            )
+                
+                        # 如果是最后一帧且有finish_message，添加完成消息
+                        is_last_frame = (i == len(screenshot_files))
+                        if is_last_frame and finish_message:
+                            # 在图片中央下方添加完成消息
+                            finish_text = f"Task Finish: {finish_message}"
                     
-                    # 在图片右上角添加帧编号
-                    x = img.width - text_width - 20
-                    y = 20
+                            # 计算可用宽度（图片宽度的80%）
+                            max_text_width = int(img.width * 0.8)
                     
-                    # 添加半透明背景
-                    background_box = [x-10, y-5, x+text_width+10, y+text_height+5]
-                    draw.rectangle(background_box, fill=(0, 0, 0, 128))
+                            # 使用多行文本绘制函数
+                            temp_x = (img.width - max_text_width) // 2
+                            temp_y = img.height - 120  # 从底部向上120像素开始
                     
-                    # 添加白色文本
-                    draw.text((x, y), frame_text, fill=(255, 255, 255), font=font)
+                            text_width, text_height = self._draw_multiline_text(
+                                draw, finish_text, finish_font, max_text_width,
+                                temp_x, temp_y, (255, 255, 255), (0, 128, 0, 180), 20
+                            )
                     
-                    # 在每一帧的页面上部绘制任务指令
-                    if task_instruction:
-                        instruction_text = f"Task: {task_instruction}"
-                        
-                        # 计算可用宽度（图片宽度的85%）
-                        max_instruction_width = int(img.width * 0.85)
-                        
-                        # 使用多行文本绘制函数绘制任务指令
-                        instruction_x = (img.width - max_instruction_width) // 2
-                        instruction_y = 20  # 从顶部向下20像素开始
-                        
-                        self._draw_multiline_text(
-                            draw, instruction_text, finish_font, max_instruction_width,
-                            instruction_x, instruction_y, (255, 255, 255), (0, 0, 0, 180), 20
-                        )
+                            # 最后一帧持续时间更长
+                            duration = 3000  # 3秒
+                        else:
+                            duration = 1000  # 普通帧1秒
                     
-                    # 如果是最后一帧且有finish_message，添加完成消息
-                    is_last_frame = (i == len(screenshot_files))
-                    if is_last_frame and finish_message:
-                        # 在图片中央下方添加完成消息
-                        finish_text = f"Task Finish: {finish_message}"
-                        
-                        # 计算可用宽度（图片宽度的80%）
-                        max_text_width = int(img.width * 0.8)
-                        
-                        # 使用多行文本绘制函数
-                        temp_x = (img.width - max_text_width) // 2
-                        temp_y = img.height - 120  # 从底部向上120像素开始
-                        
-                        text_width, text_height = self._draw_multiline_text(
-                            draw, finish_text, finish_font, max_text_width,
-                            temp_x, temp_y, (255, 255, 255), (0, 128, 0, 180), 20
-                        )
-                        
-                        # 最后一帧持续时间更长
-                        durations.append(3000)  # 3秒
-                    else:
-                        durations.append(1000)  # 普通帧1秒
-                    
-                    images.append(img)
+                        # 只对第一帧做一次中位切分量化，后续帧直接映射到同一调色板
+                        if master_palette is None:
+                            master_palette = img.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+                            return master_palette, duration
+                        return img.quantize(palette=master_palette, dither=Image.Dither.NONE), duration
                 except Exception as e:
                     print(f"无法打开图片 {file_path}: {e}")
-                    continue
-            
-            if len(images) < 2:
+                    return None
+
+            # 逐帧交给GIF编码器，不把所有解码后的帧同时留在内存里；线程池只预取有限的帧并保持顺序
+            def annotated_frames():
+                pending = iter(enumerate(screenshot_files, 1))
+                # 第一帧在当前线程处理，得到共用调色板后再并行处理其余帧
+                for i, file_path in pending:
+                    frame = annotate_frame(i, file_path)
+                    if frame is not None:
+                        durations.append(frame[1])
+                        yield frame[0]
+                        break
+
+                max_workers = os.cpu_count() or 1
+
+                def prefetched(pool):
+                    # 最多提前提交 2 * max_workers 帧，按提交顺序取回结果
+                    window = deque()
+                    for args in pending:
+                        window.append(pool.submit(annotate_frame, *args))
+                        if len(window) >= 2 * max_workers:
+                            yield window.popleft().result()
+                    while window:
+                        yield window.popleft().result()
+
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    for frame in prefetched(pool):
+                        if frame is None:
+                            continue
+                        img, duration = frame
+                        durations.append(duration)
+                        yield img
+                        # 编码器已复制该帧，立即释放
+                        img.close()
+
+            frames = annotated_frames()
+            first_frame = next(frames, None)
+            second_frame = next(frames, None)
+            if second_frame is None:
                 print("有效截图数量不足，无法生成GIF")
                 return None
             
@@ -281,12 +443,13 @@ class TextOnlyExecutor:
             gif_filename = f"{self.screenshot_dir}/task_{self.task_id}_animation.gif"
             
             # 保存为GIF，使用不同的持续时间
-            images[0].save(
+            first_frame.save(
                 gif_filename,
                 save_all=True,
-                append_images=images[1:],
+                append_images=itertools.chain([second_frame], frames),
                 duration=durations,  # 使用变长的持续时间列表
-                loop=0  # 无限循环
+                loop=0,  # 无限循环
+                optimize=False  # 帧已共用调色板，无需再优化
             )
             
             print(f"GIF动画已保存到: {gif_filename}")
@@ -297,33 +460,13 @@ class TextOnlyExecutor:
             return None
 
     def do(self, action=None, element=None, **kwargs):
-        assert action in ["Tap", "Type", "Swipe", "Enter", "Home", "Back", "Long Press", "Wait", "Launch",
-                          "Call_API"], "Unsupported Action"
+        assert action in self._ACTIONS, "Unsupported Action"
         if self.config.get('is_relative_bbox', False):
             if element is not None:
                 element = self.modify_relative_bbox(element)
-        if action == "Tap":
-            self.tap(element)
-        elif action == "Type":
-            self.type(**kwargs)
-        elif action == "Swipe":
-            self.swipe(element, **kwargs)
-        elif action == "Enter":
-            self.press_enter()
-        elif action == "Home":
-            self.press_home()
-        elif action == "Back":
-            self.press_back()
-        elif action == "Long Press":
-            self.long_press(element)
-        elif action == "Wait":
-            self.wait()
-        elif action == "Launch":
-            self.launch(**kwargs)
-        elif action == "Call_API":
-            self.call_api(**kwargs)
-        else:
-            raise NotImplementedError()
+        method_name, takes_element, takes_kwargs = self._ACTIONS[action]
+        args = (element,) if takes_element else ()
+        getattr(self, method_name)(*args, **(kwargs if takes_kwargs else {}))
         # self.__update_screenshot__() # update screenshot 全部移到recoder内
 
     def get_relative_bbox_center(self, instruction, screenshot):
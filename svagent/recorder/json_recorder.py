@@ -2,12 +2,22 @@
 
 import json
 import os
+import time
 
 import jsonlines
 
 from ..utils_mobile.utils import draw_bbox_multi
 from ..utils_mobile.xml_tool import UIXMLTree
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 
 def get_compressed_xml(xml_path, type="plain_text", version="v1"):
@@ -50,18 +60,28 @@ class JSONRecorder:
         self.xml_history = []
         self.history = []
         self.command_per_step = []
+        # 每次 update_before 记录新的一帧时递增；frame_digest 由工具写入该帧的设备端截图摘要
+        self.frame_epoch = 0
+        self.frame_digest = None
+        self.last_captured_at = 0.0  # 最近一帧采集完成时的 time.monotonic()
+        self._latest_xml_cache = (None, None)  # (frame_epoch, 压缩后的 XML)
         if config.get('version') is None or config.get('version') == "v1":
             self.xml_compressed_version = "v1"
         elif config.get('version') == "v2":
             self.xml_compressed_version = "v2"
 
-    def check_validy_path(self, controller, need_screenshot=False, ac_status=False):
-        if need_screenshot:
-            self.page_executor.update_screenshot(prefix=str(self.turn_number), suffix="before")
+    def check_validy_path(self, controller, need_screenshot=False, ac_status=False, need_xml=True, screenshot_future=None):
+        # 截图和 XML 互不依赖，截图放到 controller 的线程池里和下面的 XML 获取并行；调用方可能已经提前发起了截图
+        if need_screenshot and screenshot_future is None:
+            screenshot_future = controller.submit(self.page_executor.update_screenshot,
+                                                  prefix=str(self.turn_number), suffix="before")
         xml_path = None
         ac_xml_path = None
 
-        if not ac_status:
+        if not need_xml:
+            # 只需要截图时跳过 UI 树的 dump 和拉取
+            pass
+        elif not ac_status:
             xml_status = controller.get_xml(prefix=str(self.turn_number), save_dir=self.xml_file_path)
             if "ERROR" in xml_status:
                 xml_path = "ERROR"
@@ -73,6 +93,8 @@ class JSONRecorder:
                 ac_xml_path = "ERROR"
             else:
                 ac_xml_path = os.path.join(self.xml_file_path, 'ac_' + str(self.turn_number) + '.xml')
+        if screenshot_future is not None:
+            screenshot_future.result()
         return xml_path, ac_xml_path
 
 
@@ -108,16 +130,19 @@ class JSONRecorder:
             step["command"][command] = result
         return step
 
-    def update_before(self, controller, prompt="** XML **", need_screenshot=False, ac_status=False, need_labeled=False):
-        xml_path, ac_xml_path = self.check_validy_path(controller, need_screenshot, ac_status)
+    def update_before(self, controller, prompt="** XML **", need_screenshot=False, ac_status=False, need_labeled=False,
+                      need_xml=True, screenshot_future=None):
+        # current activity 也是一次独立的远程调用，和截图/XML 一起并行获取
+        activity_future = controller.submit(controller.get_current_activity)
+        xml_path, ac_xml_path = self.check_validy_path(controller, need_screenshot, ac_status, need_xml, screenshot_future)
         step = {
             "trace_id": self.id,
             "index": self.turn_number,
             "prompt": prompt if self.turn_number > 0 else f"{self.instruction}",
-            "image": self.page_executor.current_screenshot,
+            "image": self.page_executor.current_screenshot if need_screenshot else None,
             "xml": xml_path,
             "ac_xml": ac_xml_path,
-            "current_activity": controller.get_current_activity(),
+            "current_activity": activity_future.result(),
             "window": controller.viewport_size,
             "target": self.instruction
         }
@@ -140,6 +165,34 @@ class JSONRecorder:
             step["labeled_image"] = self.labeled_current_screenshot_path
 
         self.contents.append(step)
+        self.frame_epoch += 1
+        self.frame_digest = None
+        self.last_captured_at = time.monotonic()
+
+    def commit_turn(self, exe_res, rsp, controller, need_screenshot=True, ac_status=False, need_xml=True, frame_digest=None):
+        """
+        一次完成 update_after、turn_number 递增和 update_before，返回新一帧压缩后的 XML（need_xml=False 时返回 None）
+        新一帧的截图先在 controller 线程池里发起，和 update_after 的记录写入重叠
+        """
+        self.turn_number += 1
+        screenshot_future = None
+        if need_screenshot:
+            screenshot_future = controller.submit(self.page_executor.update_screenshot,
+                                                  prefix=str(self.turn_number), suffix="before")
+        self.update_after(exe_res, rsp)
+        self.update_before(controller=controller, need_screenshot=need_screenshot, ac_status=ac_status, need_xml=need_xml,
+                           screenshot_future=screenshot_future)
+        self.frame_digest = frame_digest
+        return self.get_latest_xml() if need_xml else None
+
+    def finalize(self, message, evidences):
+        """
+        记录 submit：标记 executor 结束并写入最后一轮，不再采集新的一帧
+        """
+        self.page_executor.finish(message, evidences)
+        self.update_after(self.page_executor.current_return,
+                          f"do('action='finish', message='{message}', evidences={evidences})")
+        self.turn_number += 1
 
     def dectect_auto_stop(self):
         if len(self.contents) <= 5:
@@ -156,6 +209,10 @@ class JSONRecorder:
     def get_latest_xml(self):
         if len(self.contents) == 0:
             return None
+        cached_epoch, cached_xml = self._latest_xml_cache
+        if cached_epoch == self.frame_epoch:
+            # 同一帧重复读取时不再重新压缩和写文件
+            return cached_xml
         # print(self.contents[-1])
         if self.contents[-1]['xml'] == "ERROR" or self.contents[-1]['xml'] is None:
             xml_path = self.contents[-1]['ac_xml']
@@ -166,6 +223,7 @@ class JSONRecorder:
                   encoding='utf-8') as f:
             f.write(xml_compressed)
         self.page_executor.latest_xml = xml_compressed
+        self._latest_xml_cache = (self.frame_epoch, xml_compressed)
         return xml_compressed
 
     def get_latest_xml_tree(self):
@@ -177,13 +235,13 @@ class JSONRecorder:
         else:
             xml_path = self.contents[-1]['xml']
         xml_compressed = get_compressed_xml(xml_path, type="json")
-        return json.loads(xml_compressed)
+        return _json_loads(xml_compressed)
 
     def update_execution(self, exe_res):
         if len(self.contents) == 0:
             return
         self.contents[-1]['parsed_action'] = exe_res
-        with jsonlines.open(self.trace_file_path, 'a') as f:
+        with jsonlines.open(self.trace_file_path, 'a', dumps=_json_dumps) as f:
             f.write(self.contents[-1])
 
     def update_after(self, exe_res, rsp):
@@ -197,6 +255,6 @@ class JSONRecorder:
             rsp = rsp + f"\n\nQuery:{call_instruction}\nResponse:{call_response}"
         self.history.append({"role": "assistant", "content": rsp})
         self.contents[-1]["current_response"] = rsp
-        with jsonlines.open(self.trace_file_path, 'a') as f:
+        with jsonlines.open(self.trace_file_path, 'a', dumps=_json_dumps) as f:
             f.write(self.contents[-1])
         self.dectect_auto_stop()
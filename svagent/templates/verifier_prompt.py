@@ -1,7 +1,11 @@
 # pylint: disable=line-too-long, function-name-too-long
+import hashlib
+import warnings
 
 
-SYSTEM_PROMPT_VERIFIER = '''
+# 系统提示词拆成几段静态常量，按 角色/规则 -> 应用提示 -> 输出格式 -> 示例 的顺序拼接，
+# 每次调用的任务和回复只追加在最后，保证请求前缀逐字节一致，便于服务端做前缀缓存
+_VERIFIER_ROLE = '''
 ## Role and Goal
 You are a meticulous and strict Verifier for an Android automation agent. Your primary role is to determine if the agent has successfully completed a given task, based on its response and the evidence it provides.
 
@@ -46,7 +50,9 @@ In this step, you must conduct a strict verification of the **Agent's Evidence**
     * **Correct Example:** "In the screenshot from Round 3, I see an input field labeled 'Title', and the text inside that field is 'work'." (This is a literal description of observations; it fails if the word 'work' isn't there).
 
 
-## Application-Specific Hints
+'''
+
+_VERIFIER_HINTS = '''## Application-Specific Hints
 To help you make more accurate judgments, here are some common-sense rules and conventions for specific types of applications. Use these hints to better interpret the true meaning of the evidence (screenshots or UI data).
 
 #### 1. Finance & Expense Apps
@@ -75,7 +81,9 @@ To help you make more accurate judgments, here are some common-sense rules and c
 
 
 
-## Your Output Format:
+'''
+
+_VERIFIER_OUTPUT_FORMAT = '''## Your Output Format:
 You must provide your verdict in the following structure:
 
 <Reasoning>
@@ -92,7 +100,9 @@ You must provide your verdict in the following structure:
 
 **NO OTHER TEXT IS ALLOWED INSIDE THE <Verdict> TAG.**
 **Do not be misled if the agent's response implies the task is unanswerable, even if it provides supporting evidence. It is highly probable that the agent simply failed to navigate to the correct user interface. In such cases, you should directly assign a verdict of FAILURE.**
----
+'''
+
+_VERIFIER_EXAMPLES = '''---
 
 # Toy Example 1
 <|im_start|>user
@@ -138,4 +148,22 @@ False
 <Verdict>
 FAILURE
 </Verdict><|im_end|>
-'''
\ No newline at end of file
+'''
+
+SYSTEM_PROMPT_VERIFIER = _VERIFIER_ROLE + _VERIFIER_HINTS + _VERIFIER_OUTPUT_FORMAT + _VERIFIER_EXAMPLES
+
+# 静态前缀的固定长度和哈希；调用方不得往这段提示词中间插入任务相关内容，修改提示词时需同步更新这两个值
+_PINNED_VERIFIER_PROMPT_LEN = 10896
+_PINNED_VERIFIER_PROMPT_SHA256 = "29539dacd0b3f8e929a486363fa37677884bdaabd5d9f823febf160e33843b00"
+
+# 可作为前缀缓存/结果缓存的键
+VERIFIER_PROMPT_CACHE_KEY = hashlib.sha256(SYSTEM_PROMPT_VERIFIER.encode('utf-8')).hexdigest()
+if len(SYSTEM_PROMPT_VERIFIER) != _PINNED_VERIFIER_PROMPT_LEN or VERIFIER_PROMPT_CACHE_KEY != _PINNED_VERIFIER_PROMPT_SHA256:
+    warnings.warn("SYSTEM_PROMPT_VERIFIER 与固定的长度/哈希不一致，验证请求的前缀缓存会失效")
+
+
+def build_verifier_prompt(task_instruction, claim):
+    """
+    构建验证请求的首条 user 消息：静态提示词在前，本次的任务描述和 agent 声明在后
+    """
+    return SYSTEM_PROMPT_VERIFIER + f"\n## Task Description\n{task_instruction}\n\n## Agent's Final Claim\n{claim}"
@@ -1,9 +1,16 @@
 # pylint: disable=line-too-long, function-name-too-long
 import base64
 import getpass
+import gzip
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from pathlib import PurePosixPath
 from typing import Union
 
 from ..link.utils import list_all_devices, execute_adb
@@ -12,14 +19,50 @@ from ..templates.packages import *
 from .utils import print_with_color
 from .utils import time_within_ten_secs
 
+# exec-out 截图连续失败这么多次后不再尝试，直接走 screencap + pull
+_EXEC_OUT_MAX_FAILURES = 3
+
+
+# wm size 输出中的 "<width>x<height>"
+_SIZE_RE = re.compile(r'(\d+)x(\d+)')
+
+
+def _retry_delay(attempt):
+    """重试间隔按 0.2s 起指数退避，最多 5s"""
+    return min(0.2 * 2 ** attempt, 5)
+
+
+def _invalidates_activity(method):
+    """会改变界面的动作执行后清掉 current activity 缓存"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._activity_cache = (0.0, None)
+    return wrapper
+
 
 class AndroidController:
-    def __init__(self, device, type="remote", instance=None):
+    # get_current_activity 结果的缓存时间（秒）
+    ACTIVITY_CACHE_TTL = 0.5
+
+    # (远程服务地址, 设备名) -> (width, height)，同一进程内重复创建 controller 时不再查询 wm size
+    _size_cache = {}
+
+    def __init__(self, device, type="remote", instance=None, size=None):
         self.device = device
         self.type = type
+        # 动作路径上反复使用的命令前缀和固定命令只拼接一次
+        self._adb_prefix = f"adb -s {device} shell"
+        self._back_cmd = f"{self._adb_prefix} input keyevent KEYCODE_BACK"
+        self._enter_cmd = f"{self._adb_prefix} input keyevent KEYCODE_ENTER"
+        self._home_cmd = f"{self._adb_prefix} input keyevent KEYCODE_HOME"
         if instance is not None:
             if hasattr(instance, 'execute_remote_adb_command'):  # Remote instance
                 self.remote_instance = instance
+                # 远程执行函数在初始化时绑定一次，execute_adb 不再每次检查 remote_instance
+                self._adb_impl = instance.execute_remote_adb_command
             else:
                 raise ValueError("Invalid instance: must be a remote instance")
         else:
@@ -27,24 +70,37 @@ class AndroidController:
         self.screenshot_dir = "/sdcard"
         self.xml_dir = "/sdcard"
         self.ac_xml_dir = "/sdcard/Android/data/com.example.android.xml_parser/files"
-        self.width, self.height = self.get_device_size()
+        self._exec_out_supported = True
+        self._exec_out_failures = 0
+        self._gzip_supported = True
+        self._last_acxml = (None, None)  # (设备端 ui.xml 的 mtime, 上次拉取到的本地路径)
+        self._activity_cache = (0.0, None)  # (获取时间, activity)
+        # 截图和 XML 等相互独立的远程调用放到这个线程池里并行执行
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        if size is None:
+            size_key = (getattr(self.remote_instance, 'base_url', None), device)
+            size = self._size_cache.get(size_key)
+            if size is None:
+                size = self._size_cache[size_key] = self.get_device_size()
+        self.width, self.height = size
         self.viewport_size = (self.width, self.height)
-        self.backslash = "\\"
 
     def execute_adb(self, adb_command, type="remote", output=True):
-        if type == "remote":
-            if hasattr(self, 'remote_instance') and self.remote_instance:
-                result = self.remote_instance.execute_remote_adb_command(adb_command)
-                if result and 'result' in result:
-                    return result['result']
-                elif result and 'error' in result:
-                    return "ERROR"
-                else:
-                    return "ERROR"
-            else:
-                return "ERROR"
-        else:
+        if type != "remote":
             raise ValueError(f"Unsupported type: {type}. Only 'remote' is supported.")
+        result = self._adb_impl(adb_command)
+        try:
+            return result['result']
+        except (KeyError, TypeError):
+            # 返回 None、error 或没有 result 字段
+            return "ERROR"
+
+    def _batch_adb(self, shell_snippets):
+        """
+        把多条设备端 shell 命令用 ; 拼成一次 adb shell 调用，只走一次远程请求
+        """
+        adb_command = f'{self._adb_prefix} "{"; ".join(shell_snippets)}"'
+        return self.execute_adb(adb_command, self.type)
 
     def get_device_size(self):
         test_time = 0
@@ -52,24 +108,69 @@ class AndroidController:
             try:
                 command = f"adb -s {self.device} shell wm size"
                 output = self.execute_adb(command, self.type)
-                resolution = output.split(":")[1].strip()
-                width, height = resolution.split("x")
+                # 有 Override size 时它在 Physical size 之后，取最后一个匹配
+                width, height = _SIZE_RE.findall(output)[-1]
                 return int(width), int(height)
             except Exception as e:
+                time.sleep(_retry_delay(test_time))
                 test_time += 1
-                time.sleep(5)
         assert False, "Error in getting device size"
         
 
+    def capture_screenshot_bytes(self):
+        """
+        用 exec-out 直接取回截图，不在设备上落盘再拉取；远程接口只返回文本，所以在设备端先做 base64
+        失败时返回 None，由调用方回退到 screencap + pull；有的远端每次都会让 exec-out 报错，连续失败多次后不再尝试
+        """
+        if not self._exec_out_supported:
+            return None
+        result = self.execute_adb(f'adb -s {self.device} exec-out "screencap -p | base64"', self.type)
+        if not result or result == "ERROR":
+            self._exec_out_failures += 1
+            if self._exec_out_failures >= _EXEC_OUT_MAX_FAILURES:
+                self._exec_out_supported = False
+            return None
+        try:
+            data = base64.b64decode(result)
+        except (ValueError, TypeError):
+            data = b""
+        if not data.startswith(b"\x89PNG"):
+            # 请求成功但拿不到 PNG，说明远端不支持这种方式，之后直接走 screencap + pull
+            self._exec_out_supported = False
+            return None
+        self._exec_out_failures = 0
+        return data
+
+    def _save_screenshot_bytes(self, local_path):
+        data = self.capture_screenshot_bytes()
+        if data is None:
+            return False
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        with open(local_path, 'wb') as f:
+            f.write(data)
+        return True
+
+    def get_screen_digest(self):
+        """
+        在设备端对原始截图做 md5，只传回 32 位摘要，用来低成本判断界面是否还在变化
+        取不到时返回 None
+        """
+        result = self._batch_adb(["screencap | md5sum"])
+        digest = result.split()[0] if result and result != "ERROR" and result.strip() else ""
+        return digest if len(digest) == 32 else None
+
     def get_screenshot(self, prefix, save_dir):
-        cap_command = f"adb -s {self.device} shell screencap -p " \
-                      f"{os.path.join(self.screenshot_dir, prefix + '.png').replace(self.backslash, '/')}"
+        local_path = os.path.join(save_dir, prefix + '.png')
+        if self._save_screenshot_bytes(local_path):
+            return local_path
+
+        # 设备端路径始终是 / 分隔，不受宿主机 os.path 影响
+        remote_path = str(PurePosixPath(self.screenshot_dir) / f"{prefix}.png")
+        cap_command = f"adb -s {self.device} shell screencap -p {remote_path}"
         
         # 对于远程实例，使用增强的文件传输功能
         result = self.execute_adb(cap_command, self.type)
         if result != "ERROR":
-            remote_path = f"{os.path.join(self.screenshot_dir, prefix + '.png').replace(self.backslash, '/')}"
-            local_path = os.path.join(save_dir, prefix + '.png')
             
             # 使用增强的文件拉取功能
             # import ipdb; ipdb.set_trace()
@@ -88,8 +189,11 @@ class AndroidController:
         return result
 
     def save_screenshot(self, save_path):
+        if self._save_screenshot_bytes(save_path):
+            return save_path
+
         prefix = os.path.basename(save_path).replace('.png', '')
-        remote_path = f"{os.path.join(self.screenshot_dir, prefix + '.png').replace(self.backslash, '/')}"
+        remote_path = str(PurePosixPath(self.screenshot_dir) / f"{prefix}.png")
         cap_command = f"adb -s {self.device} shell screencap -p {remote_path}"
         # print("Capturing screenshot to:", remote_path, "capture command:", cap_command, "type:", self.type)
         result = self.execute_adb(cap_command, self.type)
@@ -109,90 +213,157 @@ class AndroidController:
                     return save_path
         return result
 
+    def _pull_file(self, remote_path, local_path):
+        # 对于远程实例，使用增强的文件传输功能
+        if hasattr(self.remote_instance, 'pull_file_from_device'):
+            return self.remote_instance.pull_file_from_device(remote_path, local_path)
+        # 回退到原始方法
+        pull_command = f"adb -s {self.device} pull {remote_path} {local_path}"
+        return self.execute_adb(pull_command, self.type) != "ERROR"
+
+    def _pull_xml(self, remote_path, local_path):
+        """
+        XML 重复度很高，调用方先在设备端把 remote_path gzip 成 remote_path + '.gz'，这里拉取 .gz 并在本地解压，传输量大约只有原来的 1/10
+        .gz 拉取失败时回退为直接拉取原文件；只有解压失败这种 gzip 本身的问题才关闭 gzip，网络抖动不会
+        """
+        gz_remote = remote_path + '.gz'
+        gz_local = local_path + '.gz'
+        if self._pull_file(gz_remote, gz_local):
+            try:
+                with open(gz_local, 'rb') as f:
+                    data = gzip.decompress(f.read())
+            except (OSError, EOFError):
+                # 拉下来的不是有效的 gzip 数据，说明设备端的 gzip 不可用，之后直接拉取原文件
+                self._gzip_supported = False
+                data = b""
+            finally:
+                if os.path.exists(gz_local):
+                    os.remove(gz_local)
+            if data:
+                with open(local_path, 'wb') as f:
+                    f.write(data)
+                return True
+        return self._pull_file(remote_path, local_path)
+
     def get_xml(self, prefix, save_dir):
-        remote_path = os.path.join(self.xml_dir, prefix + '.xml').replace(self.backslash, '/')
+        remote_path = str(PurePosixPath(self.xml_dir) / f"{prefix}.xml")
         local_path = os.path.join(save_dir, prefix + '.xml')
-        dump_command = f"adb -s {self.device} shell uiautomator dump {remote_path}"
-        pull_command = f"adb -s {self.device} pull {remote_path} {local_path}"
+        gz_ready = self._gzip_supported
+        if gz_ready:
+            # dump 之后顺带在设备端压缩，省掉一次单独的 gzip 调用
+            dump_command = f'{self._adb_prefix} "uiautomator dump {remote_path} && gzip -c {remote_path} > {remote_path}.gz"'
+        else:
+            dump_command = f"adb -s {self.device} shell uiautomator dump {remote_path}"
 
         def is_file_empty(file_path):
             return os.path.exists(file_path) and os.path.getsize(file_path) == 0
 
-        for attempt in range(5):
+        def dump():
+            nonlocal gz_ready
             result = self.execute_adb(dump_command, self.type)
-            if result == "ERROR":
-                time.sleep(5)
-                continue
+            # gzip 本身报错（没有 gzip、目录不可写等）时 "dumped to ..." 之后会多出输出，之后不再走 gzip
+            if gz_ready and "dumped to" in result and len(result.split("dumped to", 1)[1].strip().splitlines()) > 1:
+                self._gzip_supported = gz_ready = False
+            return result
 
-            # 对于远程实例，使用增强的文件传输功能
-            if hasattr(self.remote_instance, 'pull_file_from_device'):
-                success = self.remote_instance.pull_file_from_device(remote_path, local_path)
-                if success and not is_file_empty(local_path):
-                    return local_path
-            else:
-                # 回退到原始方法
-                result = self.execute_adb(pull_command, self.type)
-                if result != "ERROR" and not is_file_empty(local_path):
-                    return local_path
-            time.sleep(5)
+        def pull(dumped):
+            # 只有确认 dump 成功（gzip 也随之执行）时设备上才有新的 .gz；dump 失败时直接拉取原文件
+            if gz_ready and dumped and self._gzip_supported:
+                return self._pull_xml(remote_path, local_path)
+            return self._pull_file(remote_path, local_path)
 
-        # Final attempt after 5 retries
-        result = self.execute_adb(dump_command, self.type)
-        
-        # 对于远程实例，使用增强的文件传输功能
-        if hasattr(self.remote_instance, 'pull_file_from_device'):
-            success = self.remote_instance.pull_file_from_device(remote_path, local_path)
-            if success and not is_file_empty(local_path):
-                return local_path
-        else:
-            # 回退到原始方法
-            result = self.execute_adb(pull_command, self.type)
-            if result != "ERROR" and not is_file_empty(local_path):
+        dumped = False
+        for attempt in range(5):
+            if not dumped:
+                result = dump()
+                if result == "ERROR":
+                    # 网络抖动先立即重试一次，之后再退避
+                    if attempt > 0:
+                        time.sleep(_retry_delay(attempt))
+                    continue
+                # 确认已 dump 成功后，后续只重试 pull
+                dumped = "dumped to" in result
+
+            if pull(dumped) and not is_file_empty(local_path):
                 return local_path
+            time.sleep(_retry_delay(attempt))
+
+        # Final attempt after 5 retries
+        result = dump()
+        if pull("dumped to" in result) and not is_file_empty(local_path):
+            return local_path
 
         return result
 
     def get_ac_xml(self, prefix, save_dir):
-        remote_path = f"{os.path.join(self.ac_xml_dir, 'ui.xml').replace(self.backslash, '/')}"
+        remote_path = str(PurePosixPath(self.ac_xml_dir) / "ui.xml")
         local_path = os.path.join(save_dir, prefix + '.xml')
-        pull_command = f"adb -s {self.device} pull {remote_path} {local_path}"
 
         def is_file_empty(file_path):
             return os.path.exists(file_path) and os.path.getsize(file_path) == 0
 
+        # xml_parser 只在界面变化时重写 ui.xml，mtime 没变就直接复用上次拉下来的文件
+        # 用 %y 而不是 %Y，带小数秒，避免同一秒内的两次改写被当成未变化
+        # 设备端 gzip 顺带放在 stat 这次调用里，压缩不再单独多付一次远程调用
+        gz_ready = self._gzip_supported
+        if gz_ready:
+            output = self.execute_adb(f'{self._adb_prefix} "stat -c %y {remote_path} && gzip -c {remote_path} > {remote_path}.gz"', self.type)
+        else:
+            output = self.execute_adb(f"{self._adb_prefix} stat -c %y {remote_path}", self.type)
+        lines = output.strip().splitlines()
+        mtime = lines[0].strip() if lines and lines[0][:1].isdigit() else None
+        if gz_ready and mtime is not None and len(lines) > 1:
+            # stat 成功但 gzip 报错（没有 gzip、目录不可写等），之后不再走 gzip
+            self._gzip_supported = False
+        # stat 失败时 gzip 没有执行，设备上没有新的 .gz
+        gz_ready = gz_ready and mtime is not None
+        last_mtime, last_path = self._last_acxml
+        if mtime is not None and mtime == last_mtime and last_path and os.path.exists(last_path):
+            if last_path != local_path:
+                shutil.copyfile(last_path, local_path)
+            return local_path
+
+        def pull():
+            if gz_ready and self._gzip_supported:
+                return self._pull_xml(remote_path, local_path)
+            return self._pull_file(remote_path, local_path)
+
+        result = "ERROR"
         for attempt in range(5):
-            # 对于远程实例，使用增强的文件传输功能
-            if hasattr(self.remote_instance, 'pull_file_from_device'):
-                success = self.remote_instance.pull_file_from_device(remote_path, local_path)
-                if success and not is_file_empty(local_path):
-                    return local_path
-            else:
-                # 回退到原始方法
-                result = self.execute_adb(pull_command, self.type)
-                if result != "ERROR" and not is_file_empty(local_path):
-                    return local_path
-            time.sleep(5)
+            if pull() and not is_file_empty(local_path):
+                self._last_acxml = (mtime, local_path)
+                return local_path
+            time.sleep(_retry_delay(attempt))
 
         # Final attempt after 5 retries
-        # 对于远程实例，使用增强的文件传输功能
-        if hasattr(self.remote_instance, 'pull_file_from_device'):
-            success = self.remote_instance.pull_file_from_device(remote_path, local_path)
-            if success and not is_file_empty(local_path):
-                return local_path
-        else:
-            # 回退到原始方法
-            result = self.execute_adb(pull_command, self.type)
-            if result != "ERROR" and not is_file_empty(local_path):
-                return local_path
+        if pull() and not is_file_empty(local_path):
+            self._last_acxml = (mtime, local_path)
+            return local_path
 
         return result
 
+    def submit(self, fn, *args, **kwargs):
+        """
+        在 controller 的线程池中执行 fn，返回 Future，用于和其他远程调用重叠
+        """
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
     def get_current_activity(self):
-        adb_command = "adb -s {device} shell dumpsys window | grep mCurrentFocus | awk -F '/' '{print $1}' | awk '{print $NF}'"
-        adb_command = adb_command.replace("{device}", self.device)
+        cached_at, activity = self._activity_cache
+        if activity is not None and time.monotonic() - cached_at < self.ACTIVITY_CACHE_TTL:
+            return activity
+        # 设备端只保留一个 grep 用来缩小返回的输出，原来两个 awk 的取值改在本地完成
+        adb_command = f"{self._adb_prefix} dumpsys window | grep mCurrentFocus"
         result = self.execute_adb(adb_command, self.type)
         if result != "ERROR":
-            return result
+            # 每行取 "/" 之前的最后一个字段，即包名，例如 mCurrentFocus=Window{... u0 com.android.settings/...}
+            activity = "\n".join(line.split("/")[0].split()[-1]
+                                  for line in result.splitlines() if line.split("/")[0].split())
+            self._activity_cache = (time.monotonic(), activity)
+            return activity
         return 0
 
     def get_current_app(self):
@@ -200,46 +371,49 @@ class AndroidController:
         app = find_app(activity)
         return app
 
+    @_invalidates_activity
     def back(self):
-        adb_command = f"adb -s {self.device} shell input keyevent KEYCODE_BACK"
-        ret = self.execute_adb(adb_command, self.type)
-        return ret
+        return self.execute_adb(self._back_cmd, self.type)
 
+    @_invalidates_activity
     def enter(self):
-        adb_command = f"adb -s {self.device} shell input keyevent KEYCODE_ENTER"
-        ret = self.execute_adb(adb_command, self.type)
-        return ret
+        return self.execute_adb(self._enter_cmd, self.type)
 
+    @_invalidates_activity
     def home(self):
-        adb_command = f"adb -s {self.device} shell input keyevent KEYCODE_HOME"
-        ret = self.execute_adb(adb_command, self.type)
-        return ret
+        return self.execute_adb(self._home_cmd, self.type)
 
+    @_invalidates_activity
     def tap(self, x, y):
-        adb_command = f"adb -s {self.device} shell input tap {x} {y}"
+        adb_command = f"{self._adb_prefix} input tap {x} {y}"
         ret = self.execute_adb(adb_command, self.type)
         return ret
 
+    @_invalidates_activity
     def text(self, input_str):
         # adb_command = f'adb -s {self.device} input keyevent KEYCODE_MOVE_END'
         # ret = self.execute_adb(adb_command, self.type)
-        adb_command = f'adb -s {self.device} shell input keyevent --press $(for i in {{1..100}}; do echo -n "67 "; done)'
-        ret = self.execute_adb(adb_command, self.type)
         chars = input_str
-        charsb64 = str(base64.b64encode(chars.encode('utf-8')))[1:]
-        adb_command = f"adb -s {self.device} shell am broadcast -a ADB_INPUT_B64 --es msg {charsb64}"
-        ret = self.execute_adb(adb_command, self.type)
+        charsb64 = base64.b64encode(chars.encode('utf-8')).decode('ascii')
+        # 用 ADBKeyBoard 的 ADB_CLEAR_TEXT 一次清空输入框（代替 100 次 KEYCODE_DEL），和广播输入合并成一次 adb shell 调用
+        ret = self._batch_adb([
+            "am broadcast -a ADB_CLEAR_TEXT",
+            f"am broadcast -a ADB_INPUT_B64 --es msg {charsb64}",
+        ])
         return ret
 
+    @_invalidates_activity
     def long_press(self, x, y, duration=1000):
-        adb_command = f"adb -s {self.device} shell input swipe {x} {y} {x} {y} {duration}"
+        adb_command = f"{self._adb_prefix} input swipe {x} {y} {x} {y} {duration}"
         ret = self.execute_adb(adb_command, self.type)
         return ret
 
+    @_invalidates_activity
     def kill_package(self, package_name):
-        command = f"adb -s {self.device} shell am force-stop {package_name}"
+        command = f"{self._adb_prefix} am force-stop {package_name}"
         self.execute_adb(command, self.type)
 
+    @_invalidates_activity
     def swipe(self, x, y, direction, dist: Union[str, int] = "medium", quick=False):
         if x == None:
             x = self.width // 2
@@ -264,33 +438,46 @@ class AndroidController:
         else:
             return "ERROR"
         duration = 100 if quick else 400
-        adb_command = f"adb -s {self.device} shell input swipe {x} {y} {x + offset[0]} {y + offset[1]} {duration}"
+        adb_command = f"{self._adb_prefix} input swipe {x} {y} {x + offset[0]} {y + offset[1]} {duration}"
         ret = self.execute_adb(adb_command, self.type)
         return ret
 
+    @_invalidates_activity
     def swipe_precise(self, start, end, duration=400):
-        start_x, start_y = start
-        end_x, end_y = end
-        adb_command = f"adb -s {self.device} shell input swipe {start_x} {start_x} {end_x} {end_y} {duration}"
+        # 坐标限制在屏幕范围内，避免设备端拒绝后再重试
+        start_x, start_y = min(max(start[0], 0), self.width - 1), min(max(start[1], 0), self.height - 1)
+        end_x, end_y = min(max(end[0], 0), self.width - 1), min(max(end[1], 0), self.height - 1)
+        adb_command = f"{self._adb_prefix} input swipe {start_x} {start_y} {end_x} {end_y} {duration}"
         ret = self.execute_adb(adb_command, self.type)
         return ret
 
+    @_invalidates_activity
     def launch_app(self, package_name):
-        command = f"adb -s {self.device} shell monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
+        command = f"{self._adb_prefix} monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
         ret = self.execute_adb(command, self.type)
         return ret
 
     def start_screen_record(self, prefix):
         print("Starting screen record")
-        command = f'adb -s {self.device} shell screenrecord /sdcard/{prefix}.mp4'
-        return subprocess.Popen(command, shell=True)
+        command = ["adb", "-s", self.device, "shell", "screenrecord", f"/sdcard/{prefix}.mp4"]
+        return subprocess.Popen(command)
 
+    @_invalidates_activity
     def launch(self, package_name):
-        command = f"adb -s {self.device} shell monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
+        command = f"{self._adb_prefix} monkey -p {package_name} -c android.intent.category.LAUNCHER 1"
         self.execute_adb(command, self.type)
 
+    @_invalidates_activity
     def run_command(self, command):
-        command = command.replace("adb", f"adb -s {self.device} ")
+        # 只替换开头的 adb，命令其他位置出现的 "adb" 子串保持不变
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            tokens = None
+        if tokens and tokens[0] == "adb":
+            command = shlex.join(["adb", "-s", self.device] + tokens[1:])
+        elif tokens is None and command.startswith("adb"):
+            command = f"adb -s {self.device}" + command[len("adb"):]
         return self.execute_adb(command, self.type)
 
     def check_ac_survive(self):
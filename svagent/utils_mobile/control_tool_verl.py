@@ -13,43 +13,258 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import itertools
 import json
 import logging
+import math
+import os
 import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Any, Optional
-from uuid import uuid4
 
 from verl.tools.base_tool import BaseTool
 from verl.tools.schemas import OpenAIFunctionToolSchema
 
 logger = logging.getLogger(__name__)
 
+# 进程内递增的工具实例 id，登记表也只在本进程内使用，不需要 uuid
+_next_instance_id = itertools.count()
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 工具里阻塞的设备操作和记录都放到这个线程池执行，不占用事件循环默认线程池；
+# 每个 mobile_session 同时最多占一个线程，线程数可用 SVAGENT_ADB_WORKERS 按设备数调整
+_ADB_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("SVAGENT_ADB_WORKERS", "32")), thread_name_prefix="adb")
+
+
+async def _run_blocking(func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(_ADB_POOL, partial(func, *args, **kwargs))
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+# _parse_params 遇到含 list/dict 值的参数时返回它，表示不缓存、由调用方重新解析
+_NESTED = object()
+
+
+@lru_cache(maxsize=4096)
+def _parse_params(text):
+    """
+    解析参数字符串并缓存；只缓存值全是标量的 dict，存成 (key, value) 元组，调用方每次重建 dict
+    值里有 list/dict（如 swipe_batch 的 steps）时返回 _NESTED，不缓存可变对象，避免不同调用之间共享；非 dict 返回 None
+    """
+    parsed = _json_loads(text)
+    if not isinstance(parsed, dict):
+        return None
+    if all(isinstance(value, _SCALAR_TYPES) for value in parsed.values()):
+        return tuple(parsed.items())
+    return _NESTED
+
+
+def _coerce_params(parameters):
+    """工具参数可能以 JSON 字符串传入，统一解析；解析失败时返回空 dict"""
+    if isinstance(parameters, (str, bytes)):
+        try:
+            items = _parse_params(parameters)
+            if items is _NESTED:
+                return _json_loads(parameters)
+        except ValueError:
+            logger.warning("string format parameters=%r cannot be loaded as dict!", parameters)
+            return {}
+        return dict(items) if items is not None else {}
+    return parameters or {}
+
+
+@dataclass
+class _ToolInstance:
+    """create() 登记的单个工具实例状态"""
+    __slots__ = ("mobile_session", "accessibility", "use_ui_tree", "fast_mode")
+    mobile_session: Any
+    accessibility: bool
+    use_ui_tree: bool
+    fast_mode: bool
+
 
 class DefaultTool(BaseTool):
     """A tool for smartphone screens."""
 
+    # 所有工具类共用一个实例登记表；instance_id 每次 create 都唯一，不同工具之间不会冲突
+    # 按创建顺序保存，超过 config 中的 max_instances（默认 1024）时淘汰最早的实例，防止漏调 release 时无限增长
+    _instance_dict = OrderedDict()
+    # fast_mode 下每个 mobile_session 尚未完成的后台采集任务
+    _pending_turns = weakref.WeakKeyDictionary()
+    # 设备操作和记录都放到 _ADB_POOL 里执行，同一个 mobile_session 上的工具调用用这把锁串行
+    _session_locks = weakref.WeakKeyDictionary()
+
     async def create(self, instance_id: Optional[str] = None, **kwargs) -> str:
         """Create a tool instance for controlling an Android device."""
         if instance_id is None:
-            instance_id = str(uuid4())
+            instance_id = f"t{next(_next_instance_id)}"
 
         # Extract MobileSession from kwargs
         mobile_session = kwargs['create_kwargs'].get("mobile_session")
         accessibility = kwargs['create_kwargs'].get("accessibility", False)
+        use_ui_tree = kwargs['create_kwargs'].get("use_ui_tree", True)
+        fast_mode = kwargs['create_kwargs'].get("fast_mode", False)
 
         if not mobile_session:
             raise ValueError("Missing required MobileSession object")
 
+        if not use_ui_tree and accessibility:
+            raise ValueError("use_ui_tree=False cannot be combined with accessibility, which reads the UI tree")
+
         if not mobile_session.is_ready():
             raise ValueError("MobileSession is not ready - all components must be initialized")
 
-        self._instance_dict[instance_id] = {
-            "mobile_session": mobile_session,
-            "accessibility": accessibility,
-        }
+        self._instance_dict[instance_id] = _ToolInstance(mobile_session, accessibility, use_ui_tree, fast_mode)
+        max_instances = self.config.get("max_instances", 1024)
+        while len(self._instance_dict) > max_instances:
+            evicted_id, _ = self._instance_dict.popitem(last=False)
+            logger.warning("Tool instance registry exceeded %d entries, evicting unreleased instance %s", max_instances, evicted_id)
 
         return instance_id
 
+    async def release(self, instance_id: str, **kwargs) -> None:
+        """Release the tool instance."""
+        self._instance_dict.pop(instance_id, None)
+
+    async def _wait_for_stable_ui(self, controller, min_wait=None):
+        """
+        动作后先等 settle_min_wait 秒让动作开始生效，再轮询设备端截图摘要，连续两次一致即认为界面已稳定，
+        总共最长等待 settle_max_wait 秒；settle_* 可在工具 config 中配置。返回最后一次取到的摘要（可能为 None）
+        """
+        max_wait = self.config.get("settle_max_wait", 5.0)
+        poll = self.config.get("settle_poll", 0.25)
+        if min_wait is None:
+            min_wait = self.config.get("settle_min_wait", 0.5)
+        deadline = time.monotonic() + max_wait
+        get_digest = controller.get_screen_digest
+        await asyncio.sleep(min(min_wait, max_wait))
+        previous = None
+        while True:
+            digest = await _run_blocking(get_digest)
+            remaining = deadline - time.monotonic()
+            if digest is None:
+                # 拿不到摘要时退回固定等待
+                await asyncio.sleep(max(remaining, 0))
+                return None
+            if digest == previous or remaining <= 0:
+                return digest
+            previous = digest
+            await asyncio.sleep(min(poll, remaining))
+
+    def _session_lock(self, mobile_session):
+        lock = self._session_locks.get(mobile_session)
+        if lock is None:
+            lock = self._session_locks[mobile_session] = asyncio.Lock()
+        return lock
+
+    async def _run_action(self, instance_data, action, element=None, log_str="", **do_kwargs):
+        """
+        界面动作的通用流程：下发动作 -> 等待界面稳定 -> 记录本轮并采集新的一帧
+        fast_mode 下动作下发后立即返回，等待和采集放到后台任务里，下一次工具调用开始前再等它完成
+        """
+        mobile_session = instance_data.mobile_session
+        async with self._session_lock(mobile_session):
+            await self.settle_session(mobile_session)
+            executor = mobile_session.page_executor
+            await _run_blocking(executor.do, action, element, **do_kwargs)
+            return await self._complete_action(instance_data, executor.current_return, log_str)
+
+    async def _complete_action(self, instance_data, exe_res, log_str):
+        if instance_data.fast_mode:
+            self._pending_turns[instance_data.mobile_session] = asyncio.create_task(
+                self._finish_turn(instance_data, exe_res, log_str))
+            return "", 0.0, {"success": True, "deferred": True}
+        compressed_xml_json = await self._finish_turn(instance_data, exe_res, log_str)
+        return compressed_xml_json, 0.0, {"success": True}
+
+    async def _finish_turn(self, instance_data, exe_res, log_str):
+        digest = await self._wait_for_stable_ui(instance_data.mobile_session.controller)
+        return await _run_blocking(self._commit_turn, instance_data, exe_res, log_str, digest)
+
+    @classmethod
+    async def settle_session(cls, mobile_session):
+        """
+        等待该 session 上一个 fast_mode 动作的后台采集完成；它的异常只记录，不算到当前工具头上
+        每次工具调用开始前会调用；agent loop 在释放设备前也必须调用，否则后台任务还会继续操作已释放的设备
+        """
+        task = cls._pending_turns.pop(mobile_session, None)
+        if task is not None:
+            try:
+                await task
+            except Exception as e:
+                logger.error("Error finishing deferred turn: %s", e)
+
+    @property
+    def _capture_screenshot(self):
+        """
+        返回给模型的只有 XML，截图只用于轨迹记录和 GIF；工具 config 中 capture_screenshot=False 时每一帧都不再截图
+        """
+        return self.config.get("capture_screenshot", True)
+
+    def _commit_turn(self, instance_data, exe_res, rsp, frame_digest):
+        """
+        记录本轮动作并采集新的一帧，返回给模型的 XML
+        """
+        mobile_session = instance_data.mobile_session
+        use_ui_tree = instance_data.use_ui_tree
+        compressed_xml_json = mobile_session.recorder.commit_turn(
+            exe_res, rsp, mobile_session.controller, need_screenshot=self._capture_screenshot,
+            ac_status=instance_data.accessibility, need_xml=use_ui_tree, frame_digest=frame_digest)
+        return compressed_xml_json if use_ui_tree else EMPTY_UI_TREE
+
+
+class _MobileActionTool(DefaultTool):
+    """
+    只下发一个 executor 动作、参数都原样传给 executor.do 的工具的公共实现
+    子类只需声明 default_schema、action_name 和 param_names（必填参数名）
+    """
+
+    default_schema = None
+    action_name = None
+    param_names = ()
+
+    def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
+        if tool_schema is None:
+            tool_schema = self.default_schema
+        super().__init__(config, tool_schema)
+
+    async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
+        """Execute the action on the Android device."""
+        instance_data = self._instance_dict.get(instance_id)
+        if not instance_data:
+            return "Error: Invalid instance_id", -1.0, {"success": False}
+        label = self.action_name.lower()
+        try:
+            do_kwargs = {}
+            # 无参数的动作（Back/Home/Enter）不解析 parameters
+            if self.param_names:
+                parameters = _coerce_params(parameters)
+            for name in self.param_names:
+                value = parameters.get(name)
+                if not value:
+                    return f"Error: Missing {name} parameter", -0.5, {"success": False}
+                do_kwargs[name] = value
+
+            log_str = f"do('action='{self.action_name}" + "".join(f"', {k}='{v}" for k, v in do_kwargs.items()) + "')"
+            return await self._run_action(instance_data, self.action_name, log_str=log_str, **do_kwargs)
+
+        except Exception as e:
+            logger.error("Error executing %s action: %s", label, e)
+            return f"Error executing {label} action: {e}", -1.0, {"success": False}
+
+
+# use_ui_tree=False 时工具返回的占位 UI 树
+EMPTY_UI_TREE = '{"nodes":[]}'
 
 COORDINATES_PARAMS = {
     "type": "object",
@@ -74,40 +289,37 @@ COORDINATES_PARAMS = {
     "required": ["x1", "y1", "x2", "y2"],
 }
 
+# 各工具的 schema 在模块加载时校验一次，所有工具实例共享，不再每次构造都跑 pydantic 校验
+_TAP_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "tap",
+        "description": (
+            "This function is used to tap a UI element shown on the smartphone screen by simulating "
+            "a tap action within the specified rectangular area defined by the coordinates (x1, y1) "
+            "and (x2, y2). A simple use case is tap(462,1693,619,1870), which taps the center of the "
+            "UI element, calculated to be at [540.5,1781.5]. Return a string that contains the latest "
+            "XML of the current screen."
+        ),
+        "parameters": COORDINATES_PARAMS,
+    }
+})
+
 
 class TapTool(DefaultTool):
     """A tool for tapping UI elements on smartphone screens."""
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "tap",
-                    "description": (
-                        "This function is used to tap a UI element shown on the smartphone screen by simulating "
-                        "a tap action within the specified rectangular area defined by the coordinates (x1, y1) "
-                        "and (x2, y2). A simple use case is tap(462,1693,619,1870), which taps the center of the "
-                        "UI element, calculated to be at [540.5,1781.5]. Return a string that contains the latest "
-                        "XML of the current screen."
-                    ),
-                    "parameters": COORDINATES_PARAMS,
-                }
-            })
+            tool_schema = _TAP_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute tap action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             x1 = parameters.get("x1")
             y1 = parameters.get("y1")
@@ -118,33 +330,37 @@ class TapTool(DefaultTool):
                 return "Error: Missing required coordinates", -0.5, {"success": False}
 
             element = [x1, y1, x2, y2]
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute tap action
-            executor.do("Tap", element)
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, f"do(action='Tap', element={element})")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the tap action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
+            return await self._run_action(instance_data, "Tap", element, log_str=f"do(action='Tap', element={element})")
 
         except Exception as e:
-            logger.error(f"Error executing tap action: {e}")
+            logger.error("Error executing tap action: %s", e)
             return f"Error executing tap action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+_TYPE_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "type",
+        "description": (
+            "This function is used to insert text input in an input field/box. text_input is the "
+            "string you want to insert and must be wrapped with double quotation marks. A simple "
+            "use case can be type(\"Hello, world!\"), which inserts the string \"Hello, world!\" "
+            "into the input area on the smartphone screen. This function is only callable when you "
+            "see a keyboard showing in the lower half of the screen. Return a string that contains "
+            "the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "text_input": {
+                    "type": "string",
+                    "description": "The text string to input using the keyboard."
+                }
+            },
+            "required": ["text_input"],
+        }
+    }
+})
 
 
 class TypeTool(DefaultTool):
@@ -152,76 +368,42 @@ class TypeTool(DefaultTool):
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "type",
-                    "description": (
-                        "This function is used to insert text input in an input field/box. text_input is the "
-                        "string you want to insert and must be wrapped with double quotation marks. A simple "
-                        "use case can be type(\"Hello, world!\"), which inserts the string \"Hello, world!\" "
-                        "into the input area on the smartphone screen. This function is only callable when you "
-                        "see a keyboard showing in the lower half of the screen. Return a string that contains "
-                        "the latest XML of the current screen."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "text_input": {
-                                "type": "string",
-                                "description": "The text string to input using the keyboard."
-                            }
-                        },
-                        "required": ["text_input"],
-                    }
-                }
-            })
+            tool_schema = _TYPE_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute type action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             text_input = parameters.get("text_input")
             if text_input is None:
                 return "Error: Missing text_input parameter", -0.5, {"success": False}
 
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute type action
-            executor.do("Type", text=text_input)
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, f"do('action='Type', text='{text_input}')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the type action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
+            return await self._run_action(instance_data, "Type", text=text_input, log_str=f"do('action='Type', text='{text_input}')")
 
         except Exception as e:
-            logger.error(f"Error executing type action: {e}")
+            logger.error("Error executing type action: %s", e)
             return f"Error executing type action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+_LONG_PRESS_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "long_press",
+        "description": (
+            "This function is used to long press a UI element shown on the smartphone screen. "
+            "The element is identified by the rectangular area defined by the coordinates (x1, y1) "
+            "and (x2, y2). The function calculates the center of this area and performs a long press "
+            "action at that point. A simple use case can be long_press(462,1693,619,1870), which "
+            "long presses the UI element labeled on [540.5,1781.5]. Return a string that contains "
+            "the latest XML of the current screen."
+        ),
+        "parameters": COORDINATES_PARAMS,
+    }
+})
 
 
 class LongPressTool(DefaultTool):
@@ -229,35 +411,15 @@ class LongPressTool(DefaultTool):
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "long_press",
-                    "description": (
-                        "This function is used to long press a UI element shown on the smartphone screen. "
-                        "The element is identified by the rectangular area defined by the coordinates (x1, y1) "
-                        "and (x2, y2). The function calculates the center of this area and performs a long press "
-                        "action at that point. A simple use case can be long_press(462,1693,619,1870), which "
-                        "long presses the UI element labeled on [540.5,1781.5]. Return a string that contains "
-                        "the latest XML of the current screen."
-                    ),
-                    "parameters": COORDINATES_PARAMS,
-                }
-            })
+            tool_schema = _LONG_PRESS_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute long press action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             x1 = parameters.get("x1")
             y1 = parameters.get("y1")
@@ -268,33 +430,42 @@ class LongPressTool(DefaultTool):
                 return "Error: Missing required coordinates", -0.5, {"success": False}
 
             element = [x1, y1, x2, y2]
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute long press action
-            executor.do("Long Press", element)
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, f"do('action='Long Press', element={element})")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the long press action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
+            return await self._run_action(instance_data, "Long Press", element, log_str=f"do('action='Long Press', element={element})")
 
         except Exception as e:
-            logger.error(f"Error executing long press action: {e}")
+            logger.error("Error executing long press action: %s", e)
             return f"Error executing long press action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+SWIPE_PARAMS = {
+    "type": "object",
+    "properties": {
+        **COORDINATES_PARAMS["properties"],
+        "direction": {
+            "type": "string",
+            "description": "The direction of the swipe (\"up\", \"down\", \"left\", \"right\")."
+        },
+        "dist": {
+            "type": "string",
+            "description": "The distance of the swipe, with options \"long\", \"medium\", \"short\". Defaults to \"medium\"."
+        }
+    },
+    "required": ["x1", "y1", "x2", "y2", "direction", "dist"],
+}
+
+_SWIPE_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "swipe",
+        "description": (
+            "This function simulates a swipe gesture on a smartphone screen, which can be applied "
+            "to UI elements like scroll views or slide bars. The swipe starts from the center of a "
+            "rectangular area defined by (x1, y1) and (x2, y2), then moves in a specified direction "
+            "for a certain distance. Return a string that contains the latest XML of the current screen."
+        ),
+        "parameters": SWIPE_PARAMS,
+    }
+})
 
 
 class SwipeTool(DefaultTool):
@@ -302,63 +473,15 @@ class SwipeTool(DefaultTool):
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "swipe",
-                    "description": (
-                        "This function simulates a swipe gesture on a smartphone screen, which can be applied "
-                        "to UI elements like scroll views or slide bars. The swipe starts from the center of a "
-                        "rectangular area defined by (x1, y1) and (x2, y2), then moves in a specified direction "
-                        "for a certain distance. Return a string that contains the latest XML of the current screen."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "x1": {
-                                "type": "integer",
-                                "description": "The x-coordinate of the top-left corner of the rectangle."
-                            },
-                            "y1": {
-                                "type": "integer",
-                                "description": "The y-coordinate of the top-left corner of the rectangle."
-                            },
-                            "x2": {
-                                "type": "integer",
-                                "description": "The x-coordinate of the bottom-right corner of the rectangle."
-                            },
-                            "y2": {
-                                "type": "integer",
-                                "description": "The y-coordinate of the bottom-right corner of the rectangle."
-                            },
-                            "direction": {
-                                "type": "string",
-                                "description": "The direction of the swipe (\"up\", \"down\", \"left\", \"right\")."
-                            },
-                            "dist": {
-                                "type": "string",
-                                "description": "The distance of the swipe, with options \"long\", \"medium\", \"short\". Defaults to \"medium\"."
-                                
-                            }
-                        },
-                        "required": ["x1", "y1", "x2", "y2", "direction", "dist"],
-                    }
-                }
-            })
+            tool_schema = _SWIPE_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute swipe action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             x1 = parameters.get("x1")
             y1 = parameters.get("y1")
@@ -371,164 +494,164 @@ class SwipeTool(DefaultTool):
                 return "Error: Missing required parameters", -0.5, {"success": False}
 
             element = [x1, y1, x2, y2]
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute swipe action
-            executor.do("Swipe", element, direction=direction, dist=dist)
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, f"do('action='Swipe', element={element}, direction='{direction}', dist='{dist}')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the swipe action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
+            return await self._run_action(instance_data, "Swipe", element, direction=direction, dist=dist, log_str=f"do('action='Swipe', element={element}, direction='{direction}', dist='{dist}')")
 
         except Exception as e:
-            logger.error(f"Error executing swipe action: {e}")
+            logger.error("Error executing swipe action: %s", e)
             return f"Error executing swipe action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
 
+_SWIPE_BATCH_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "swipe_batch",
+        "description": (
+            "This function performs several swipe gestures back-to-back, e.g. to scroll through a long list, "
+            "and only captures the screen once after the last swipe. Each step has the same fields as swipe. "
+            "Return a string that contains the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "items": SWIPE_PARAMS,
+                    "description": "The swipes to perform in order."
+                }
+            },
+            "required": ["steps"],
+        }
+    }
+})
 
-class BackTool(DefaultTool):
-    """A tool for pressing the back button on smartphone screens."""
+
+class SwipeBatchTool(DefaultTool):
+    """A tool for performing several swipes with a single screen capture at the end."""
+
+    # 相邻两次滑动之间的间隔（秒），只需让上一次滑动的惯性停下
+    STEP_INTERVAL = 0.3
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "back",
-                    "description": (
-                        "Simulates a back button press. This method navigates the user back to the "
-                        "previous screen or state in the application or operating system. Return a string that "
-                        "contains the latest XML of the current screen."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": [],
-                    }
-                }
-            })
+            tool_schema = _SWIPE_BATCH_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
-        """Execute back action on the Android device."""
+        """Execute a batch of swipe actions on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute back action
-            executor.do("Back")
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, "do('action='Back')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the back action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-            
-            return compressed_xml_json, 0.0, {"success": True}
+            steps = parameters.get("steps")
+            if not steps or not isinstance(steps, list):
+                return "Error: Missing steps parameter", -0.5, {"success": False}
+            swipes = []
+            for step in steps:
+                element = [step.get(k) for k in ("x1", "y1", "x2", "y2")] if isinstance(step, dict) else [None]
+                if any(coord is None for coord in element) or not step.get("direction") or not step.get("dist"):
+                    return "Error: Missing required parameters", -0.5, {"success": False}
+                swipes.append((element, step["direction"], step["dist"]))
+
+            mobile_session = instance_data.mobile_session
+            async with self._session_lock(mobile_session):
+                await self.settle_session(mobile_session)
+                executor = mobile_session.page_executor
+                for i, (element, direction, dist) in enumerate(swipes):
+                    if i > 0:
+                        await asyncio.sleep(self.STEP_INTERVAL)
+                    await _run_blocking(executor.do, "Swipe", element, direction=direction, dist=dist)
+
+                exe_res = {"operation": "do", "action": 'Swipe Batch', "kwargs": {"steps": steps}}
+                return await self._complete_action(instance_data, exe_res, f"do('action='Swipe Batch', steps={steps})")
 
         except Exception as e:
-            logger.error(f"Error executing back action: {e}")
-            return f"Error executing back action: {e}", -1.0, {"success": False}
+            logger.error("Error executing swipe batch action: %s", e)
+            return f"Error executing swipe batch action: {e}", -1.0, {"success": False}
+
+
+_BACK_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "back",
+        "description": (
+            "Simulates a back button press. This method navigates the user back to the "
+            "previous screen or state in the application or operating system. Return a string that "
+            "contains the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        }
+    }
+})
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+class BackTool(_MobileActionTool):
+    """A tool for pressing the back button on smartphone screens."""
+
+    default_schema = _BACK_SCHEMA
+    action_name = "Back"
+
+
+_HOME_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "home",
+        "description": (
+            "Simulates pressing the home button. This method takes the user to the home "
+            "screen of the device, minimizing the current application or context. It\'s akin to exiting "
+            "the current state and returning to the main dashboard or operating system\'s primary "
+            "interface. Return a string that contains the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        }
+    }
+})
 
 
-class HomeTool(DefaultTool):
+class HomeTool(_MobileActionTool):
     """A tool for pressing the home button on smartphone screens."""
 
-    def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
-        if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "home",
+    default_schema = _HOME_SCHEMA
+    action_name = "Home"
+
+
+_SUBMIT_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "submit",
+        "description": "Submit the evidences when completes the task.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "A message to print before exiting."
+                }, 
+                "evidences": {
+                    "type": "array",
+                    "items": {
+                        "type": "integer"
+                    },
                     "description": (
-                        "Simulates pressing the home button. This method takes the user to the home "
-                        "screen of the device, minimizing the current application or context. It\'s akin to exiting "
-                        "the current state and returning to the main dashboard or operating system\'s primary "
-                        "interface. Return a string that contains the latest XML of the current screen."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": [],
-                    }
+                        "A list of integers representing the IDs of the decisive evidence "
+                        "steps that led to the successful completion of the task. If the task "
+                        "was not completed successfully, this list can be empty. An individual "
+                        "piece of evidence is a **Tool Call**. This includes its unique ID, "
+                        "its input parameters, and its output result. Each tool call is assigned "
+                        "a unique number `x`, formatted as `[TOOL CALL ID: x]`"
+                    )
                 }
-            })
-        super().__init__(config, tool_schema)
-        self._instance_dict = {}
-
-    async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
-        """Execute home action on the Android device."""
-        instance_data = self._instance_dict.get(instance_id)
-        if not instance_data:
-            return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
-        try:
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute home action
-            executor.do("Home")
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, "do('action='Home')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the home action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
-
-        except Exception as e:
-            logger.error(f"Error executing home action: {e}")
-            return f"Error executing home action: {e}", -1.0, {"success": False}
-
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+            },
+            "required": ["message", "evidences"],
+        }
+    }
+})
 
 
 class SubmitTool(DefaultTool):
@@ -536,77 +659,51 @@ class SubmitTool(DefaultTool):
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "submit",
-                    "description": "Submit the evidences when completes the task.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "message": {
-                                "type": "string",
-                                "description": "A message to print before exiting."
-                            }, 
-                            "evidences": {
-                                "type": "array",
-                                "items": {
-                                    "type": "integer"
-                                },
-                                "description": (
-                                    "A list of integers representing the IDs of the decisive evidence "
-                                    "steps that led to the successful completion of the task. If the task "
-                                    "was not completed successfully, this list can be empty. An individual "
-                                    "piece of evidence is a **Tool Call**. This includes its unique ID, "
-                                    "its input parameters, and its output result. Each tool call is assigned "
-                                    "a unique number `x`, formatted as `[TOOL CALL ID: x]`"
-                                )
-                            }
-                        },
-                        "required": ["message", "evidences"],
-                    }
-                }
-            })
+            tool_schema = _SUBMIT_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute submit action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             message = parameters.get("message", None)
             evidences = parameters.get("evidences", [])
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
+            mobile_session = instance_data.mobile_session
 
-            # Execute submit action
-            executor.finish(message, evidences)
-            recorder.update_after(executor.current_return, f"do('action='finish', message='{message}', evidences={evidences})")
-            recorder.turn_number += 1
-            time.sleep(1.0)  # Wait for the submit action to complete
+            async with self._session_lock(mobile_session):
+                await self.settle_session(mobile_session)
+                # Execute submit action；submit 是终止动作，不涉及界面，记录后直接返回
+                await _run_blocking(mobile_session.recorder.finalize, message, evidences)
             return f"Task Complete. Your Message is {message} and Your Submitted Evidences are {evidences}\n**PLEASE STOP CALLING ANY TOOL NOW AND OUTPUT THE ANSWER.**", 1.0, {"success": True, "completed": True}
 
         except Exception as e:
-            logger.error(f"Error executing submit action: {e}")
+            logger.error("Error executing submit action: %s", e)
             return f"Error executing submit action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+_WAIT_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "wait",
+        "description": (
+            "This function is used to wait for a specified amount of time (in seconds). "
+            "It can be useful when waiting for UI elements to load or animations to complete."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "seconds": {
+                    "type": "number",
+                    "description": "The number of seconds to wait."
+                }
+            },
+            "required": ["seconds"],
+        }
+    }
+})
 
 
 class WaitTool(DefaultTool):
@@ -614,260 +711,279 @@ class WaitTool(DefaultTool):
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "wait",
-                    "description": (
-                        "This function is used to wait for a specified amount of time (in seconds). "
-                        "It can be useful when waiting for UI elements to load or animations to complete."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "seconds": {
-                                "type": "number",
-                                "description": "The number of seconds to wait."
-                            }
-                        },
-                        "required": ["seconds"],
-                    }
-                }
-            })
+            tool_schema = _WAIT_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
         """Execute wait action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
             seconds = int(parameters.get("seconds", 5.0))
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute wait action
-            executor.do("Wait", seconds=seconds)
-            time.sleep(1.0)
-            recorder.update_after("wait_completed", f"do('action='Wait', seconds={seconds})")
-            recorder.turn_number += 1
-            time.sleep(5)
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
+            mobile_session = instance_data.mobile_session
+            async with self._session_lock(mobile_session):
+                await self.settle_session(mobile_session)
+
+                # Execute wait action; executor.wait 会阻塞事件循环且忽略 seconds 固定等 5 秒，
+                # 这里直接按 seconds 异步等待，上限为 config 中的 max_wait_seconds（默认 30 秒）
+                await asyncio.sleep(min(max(seconds, 0), self.config.get("max_wait_seconds", 30)))
+                digest = await self._wait_for_stable_ui(mobile_session.controller, min_wait=0)
+                compressed_xml_json = await _run_blocking(
+                    self._commit_turn, instance_data, {"operation": "do", "action": 'Wait', "kwargs": {"seconds": seconds}},
+                    f"do('action='Wait', seconds={seconds})", digest)
             return compressed_xml_json, 0.0, {"success": True}
 
         except Exception as e:
-            logger.error(f"Error executing wait action: {e}")
+            logger.error("Error executing wait action: %s", e)
             return f"Error executing wait action: {e}", -1.0, {"success": False}
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+
+_ENTER_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "enter",
+        "description": (
+            "This function is used to press the Enter key on the smartphone. It simulates "
+            "pressing the Enter key and returns the latest XML of the current screen "
+            "after the action completes."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        }
+    }
+})
 
 
-class EnterTool(DefaultTool):
+class EnterTool(_MobileActionTool):
     """A tool for pressing the Enter key."""
 
+    default_schema = _ENTER_SCHEMA
+    action_name = "Enter"
+
+
+_LAUNCH_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "launch",
+        "description": (
+            "Launches a specified application on the device."
+            "The app parameter should be the name of the application to launch. Return a string that contains the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "app": {
+                    "type": "string",
+                    "description": 'The name of the application to launch (e.g., "Chrome", "Calculator", "Settings").'
+                }
+            },
+            "required": ["app"],
+        }
+    }
+})
+
+
+class LaunchTool(_MobileActionTool):
+    """A tool for launching applications on smartphone screens."""
+
+    default_schema = _LAUNCH_SCHEMA
+    action_name = "Launch"
+    param_names = ("app",)
+
+
+_GET_CURRENT_XML_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "get_current_xml",
+        "description": (
+            "This function is used to get the current XML representation of the smartphone screen "
+            "without performing any action. It returns the latest XML of the current screen state."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {},
+            "required": [],
+        }
+    }
+})
+
+
+class GetCurrentXMLTool(DefaultTool):
+    """A tool for getting the current XML representation of the smartphone screen."""
+
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "enter",
-                    "description": (
-                        "This function is used to press the Enter key on the smartphone. It simulates "
-                        "pressing the Enter key and returns the latest XML of the current screen "
-                        "after the action completes."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": [],
-                    }
-                }
-            })
+            tool_schema = _GET_CURRENT_XML_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
-        """Execute enter action on the Android device."""
+        """Execute get current XML action on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
         try:
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
+            mobile_session = instance_data.mobile_session
+            accessibility = instance_data.accessibility
+            use_ui_tree = instance_data.use_ui_tree
             
             # Get components from mobile_session
-            executor = mobile_session.page_executor
             controller = mobile_session.controller
             recorder = mobile_session.recorder
 
-            # Execute enter action
-            executor.do("Enter")
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, "do('action='Enter')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the enter action to complete
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
+            async with self._session_lock(mobile_session):
+                await self.settle_session(mobile_session)
+                # Get current XML；上一帧是界面稳定后刚采集的（xml_freshness_sec 秒内）时直接复用，连摘要都不取
+                fresh = (recorder.frame_digest is not None
+                         and time.monotonic() - recorder.last_captured_at < self.config.get("xml_freshness_sec", 1.5))
+                if not fresh:
+                    # 否则界面摘要和上一次记录的帧一致时也直接复用，不再重新截图和 dump
+                    digest = await _run_blocking(controller.get_screen_digest)
+                    if digest is None or digest != recorder.frame_digest:
+                        await _run_blocking(recorder.update_before, controller=controller, need_screenshot=self._capture_screenshot, ac_status=accessibility, need_xml=use_ui_tree)
+                        recorder.frame_digest = digest
+                compressed_xml_json = await _run_blocking(recorder.get_latest_xml) if use_ui_tree else EMPTY_UI_TREE
+
             return compressed_xml_json, 0.0, {"success": True}
 
         except Exception as e:
-            logger.error(f"Error executing enter action: {e}")
-            return f"Error executing enter action: {e}", -1.0, {"success": False}
-
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+            logger.error("Error getting current XML: %s", e)
+            return f"Error getting current XML: {e}", -1.0, {"success": False}
 
 
-class LaunchTool(DefaultTool):
-    """A tool for launching applications on smartphone screens."""
+# batch_actions 支持的动作：executor 动作名（wait 为 None，直接异步等待）、是否需要坐标、
+# 其余必填参数 (工具参数名, executor.do 关键字参数名)
+_BATCH_ACTIONS = {
+    "tap": ("Tap", True, ()),
+    "long_press": ("Long Press", True, ()),
+    "swipe": ("Swipe", True, (("direction", "direction"), ("dist", "dist"))),
+    "type": ("Type", False, (("text_input", "text"),)),
+    "back": ("Back", False, ()),
+    "home": ("Home", False, ()),
+    "enter": ("Enter", False, ()),
+    "launch": ("Launch", False, (("app", "app"),)),
+    "wait": (None, False, (("seconds", "seconds"),)),
+}
 
-    def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
-        if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "launch",
-                    "description": (
-                        "Launches a specified application on the device."
-                        "The app parameter should be the name of the application to launch. Return a string that contains the latest XML of the current screen."
-                    ),
-                    "parameters": {
+_BATCH_ACTION_SCHEMA = OpenAIFunctionToolSchema.model_validate({
+    "type": "function",
+    "function": {
+        "name": "batch_actions",
+        "description": (
+            "This function performs several actions back-to-back, e.g. launch an app, wait, then press enter, "
+            "and only captures the screen once after the last action. Each action names one of the other tools "
+            "and carries that tool's parameters. Use it only when the later actions do not depend on the screen "
+            "produced by the earlier ones. Return a string that contains the latest XML of the current screen."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "actions": {
+                    "type": "array",
+                    "items": {
                         "type": "object",
                         "properties": {
+                            "action": {
+                                "type": "string",
+                                "enum": list(_BATCH_ACTIONS),
+                                "description": "The action to perform."
+                            },
+                            **SWIPE_PARAMS["properties"],
+                            "text_input": {
+                                "type": "string",
+                                "description": "The text string to input, for type."
+                            },
                             "app": {
                                 "type": "string",
-                                "description": 'The name of the application to launch (e.g., "Chrome", "Calculator", "Settings").'
+                                "description": "The name of the application, for launch."
+                            },
+                            "seconds": {
+                                "type": "number",
+                                "description": "The number of seconds, for wait."
                             }
                         },
-                        "required": ["app"],
-                    }
+                        "required": ["action"],
+                    },
+                    "description": "The actions to perform in order."
                 }
-            })
-        super().__init__(config, tool_schema)
-        self._instance_dict = {}
-
-    async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
-        """Execute launch action on the Android device."""
-        instance_data = self._instance_dict.get(instance_id)
-        if not instance_data:
-            return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
-        try:
-            app = parameters.get("app")
-            if not app:
-                return "Error: Missing app parameter", -0.5, {"success": False}
-
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            executor = mobile_session.page_executor
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Execute launch action
-            executor.do("Launch", app=app)
-            time.sleep(1.0)
-            recorder.update_after(executor.current_return, f"do('action='Launch', app='{app}')")
-            recorder.turn_number += 1
-            time.sleep(5)  # Wait for the application to launch
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
-
-            return compressed_xml_json, 0.0, {"success": True}
-
-        except Exception as e:
-            logger.error(f"Error executing launch action: {e}")
-            return f"Error executing launch action: {e}", -1.0, {"success": False}
+            },
+            "required": ["actions"],
+        }
+    }
+})
 
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
 
+class BatchActionTool(DefaultTool):
+    """A tool for performing several actions with a single screen capture at the end."""
 
-class GetCurrentXMLTool(DefaultTool):
-    """A tool for getting the current XML representation of the smartphone screen."""
+    # 相邻两个动作之间的间隔（秒）；需要等界面加载时应在动作列表里显式加 wait
+    STEP_INTERVAL = 0.3
 
     def __init__(self, config: dict, tool_schema: Optional[OpenAIFunctionToolSchema] = None):
         if tool_schema is None:
-            tool_schema = OpenAIFunctionToolSchema.model_validate({
-                "type": "function",
-                "function": {
-                    "name": "get_current_xml",
-                    "description": (
-                        "This function is used to get the current XML representation of the smartphone screen "
-                        "without performing any action. It returns the latest XML of the current screen state."
-                    ),
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": [],
-                    }
-                }
-            })
+            tool_schema = _BATCH_ACTION_SCHEMA
         super().__init__(config, tool_schema)
-        self._instance_dict = {}
+
+    @staticmethod
+    def _parse_step(step):
+        """
+        把一个动作解析成 (executor 动作名, element, do_kwargs)；参数不全时返回 None
+        """
+        if not isinstance(step, dict) or step.get("action") not in _BATCH_ACTIONS:
+            return None
+        action, use_element, param_names = _BATCH_ACTIONS[step["action"]]
+        element = None
+        if use_element:
+            element = [step.get(k) for k in ("x1", "y1", "x2", "y2")]
+            if any(coord is None for coord in element):
+                return None
+        do_kwargs = {}
+        for name, kwarg in param_names:
+            if step.get(name) is None:
+                return None
+            do_kwargs[kwarg] = step[name]
+        if action is None:
+            # wait 的秒数在这里就转换好，不是有限数字时整批拒绝，不会执行到一半才出错
+            try:
+                do_kwargs["seconds"] = float(do_kwargs["seconds"])
+            except (TypeError, ValueError):
+                return None
+            if not math.isfinite(do_kwargs["seconds"]):
+                return None
+        return action, element, do_kwargs
 
     async def execute(self, instance_id: str, parameters: dict[str, Any], **kwargs) -> tuple[str, float, dict]:
-        """Execute get current XML action on the Android device."""
+        """Execute a batch of actions on the Android device."""
         instance_data = self._instance_dict.get(instance_id)
         if not instance_data:
             return "Error: Invalid instance_id", -1.0, {"success": False}
-        if type(parameters) is str:
-            try:
-                parameters = json.loads(parameters)
-            except:
-                print(f"🚨 string format {parameters=} cannot be loaded as dict!")
-                parameters = {}
+        parameters = _coerce_params(parameters)
         try:
-            mobile_session = instance_data["mobile_session"]
-            accessibility = instance_data["accessibility"]
-            
-            # Get components from mobile_session
-            controller = mobile_session.controller
-            recorder = mobile_session.recorder
-
-            # Get current XML
-            recorder.update_before(controller=controller, need_screenshot=True, ac_status=accessibility)
-            compressed_xml_json = recorder.get_latest_xml()
+            actions = parameters.get("actions")
+            if not actions or not isinstance(actions, list):
+                return "Error: Missing actions parameter", -0.5, {"success": False}
+            parsed = [self._parse_step(step) for step in actions]
+            if any(step is None for step in parsed):
+                return "Error: Missing required parameters", -0.5, {"success": False}
 
-            return compressed_xml_json, 0.0, {"success": True}
+            mobile_session = instance_data.mobile_session
+            async with self._session_lock(mobile_session):
+                await self.settle_session(mobile_session)
+                executor = mobile_session.page_executor
+                for i, (action, element, do_kwargs) in enumerate(parsed):
+                    if i > 0:
+                        await asyncio.sleep(self.STEP_INTERVAL)
+                    if action is None:
+                        await asyncio.sleep(min(max(do_kwargs["seconds"], 0), self.config.get("max_wait_seconds", 30)))
+                    else:
+                        await _run_blocking(executor.do, action, element, **do_kwargs)
+
+                exe_res = {"operation": "do", "action": 'Action Batch', "kwargs": {"actions": actions}}
+                return await self._complete_action(instance_data, exe_res, f"do('action='Action Batch', actions={actions})")
 
         except Exception as e:
-            logger.error(f"Error getting current XML: {e}")
-            return f"Error getting current XML: {e}", -1.0, {"success": False}
-
-    async def release(self, instance_id: str, **kwargs) -> None:
-        """Release the tool instance."""
-        if instance_id in self._instance_dict:
-            del self._instance_dict[instance_id]
+            logger.error("Error executing batch action: %s", e)
+            return f"Error executing batch action: {e}", -1.0, {"success": False}
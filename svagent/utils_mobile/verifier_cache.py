@@ -0,0 +1,86 @@
+# pylint: disable=line-too-long, function-name-too-long
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+
+
+class VerifierCache:
+    """
+    验证结果缓存，基于 SQLite，可在多个进程之间共享。
+    键为 (模型名, 完整验证消息) 的 SHA-256，消息里已包含任务描述、agent 声明和全部证据内容，
+    因此只有完全相同的验证请求才会命中。
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, model TEXT, results TEXT, hits INTEGER DEFAULT 0)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        打开连接并在一个事务里执行，结束后提交（异常时回滚）并关闭连接
+        sqlite3 连接自身的 with 只管事务、不会关闭连接
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model_name, messages):
+        """
+        根据模型名和验证消息计算缓存键
+        """
+        payload = json.dumps({"model": model_name, "messages": messages}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        查询缓存，命中时返回 [(success, valid_evidence, response_text), ...]，否则返回 None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT results FROM verdicts WHERE key = ?", (key,)).fetchone()
+            stat = "hits" if row is not None else "misses"
+            if row is not None:
+                conn.execute("UPDATE verdicts SET hits = hits + 1 WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO stats (name, value) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1", (stat,)
+            )
+        if row is None:
+            return None
+        return [tuple(item) for item in json.loads(row[0])]
+
+    def put(self, key, model_name, results):
+        """
+        写入一组验证结果
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, model, results, hits) VALUES (?, ?, ?, 0)",
+                (key, model_name, json.dumps([list(item) for item in results], ensure_ascii=False)),
+            )
+
+    def stats(self):
+        """
+        返回累计的命中/未命中次数
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, value FROM stats").fetchall()
+        return {"hits": 0, "misses": 0, **dict(rows)}
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("verl")
+
+from svagent.page_executor.text_executor import TextOnlyExecutor
+from svagent.utils_mobile.control_tool_verl import _BATCH_ACTIONS, BatchActionTool
+
+COORDS = {"x1": 10, "y1": 20, "x2": 110, "y2": 220}
+ELEMENT = [10, 20, 110, 220]
+
+# 每个批量动作的一组完整参数
+FULL_STEPS = {
+    "tap": {"action": "tap", **COORDS},
+    "long_press": {"action": "long_press", **COORDS},
+    "swipe": {"action": "swipe", **COORDS, "direction": "up", "dist": "medium"},
+    "type": {"action": "type", "text_input": "hello"},
+    "back": {"action": "back"},
+    "home": {"action": "home"},
+    "enter": {"action": "enter"},
+    "launch": {"action": "launch", "app": "Settings"},
+    "wait": {"action": "wait", "seconds": 2},
+}
+
+
+def test_parse_step_maps_to_executor_calls():
+    parse = BatchActionTool._parse_step
+    assert parse(FULL_STEPS["tap"]) == ("Tap", ELEMENT, {})
+    assert parse(FULL_STEPS["swipe"]) == ("Swipe", ELEMENT, {"direction": "up", "dist": "medium"})
+    assert parse(FULL_STEPS["type"]) == ("Type", None, {"text": "hello"})
+    assert parse(FULL_STEPS["launch"]) == ("Launch", None, {"app": "Settings"})
+    assert parse(FULL_STEPS["back"]) == ("Back", None, {})
+
+
+@pytest.mark.parametrize("seconds, expected", [(2, 2.0), (1.5, 1.5), ("3", 3.0), (0, 0.0)])
+def test_parse_step_converts_wait_seconds(seconds, expected):
+    assert BatchActionTool._parse_step({"action": "wait", "seconds": seconds}) == (None, None, {"seconds": expected})
+
+
+@pytest.mark.parametrize("step", [
+    None,
+    "tap",
+    {},
+    {"action": "scroll"},
+    {"action": "tap", "x1": 10, "y1": 20, "x2": 110},
+    {"action": "type"},
+    {"action": "launch", "app": None},
+    {"action": "wait"},
+    {"action": "wait", "seconds": "abc"},
+    {"action": "wait", "seconds": [1]},
+    {"action": "wait", "seconds": {"value": 1}},
+    {"action": "wait", "seconds": "nan"},
+])
+def test_parse_step_rejects_incomplete_or_invalid_steps(step):
+    assert BatchActionTool._parse_step(step) is None
+
+
+def test_batch_actions_cover_executor_actions():
+    assert set(FULL_STEPS) == set(_BATCH_ACTIONS)
+    for name, (action, _, _) in _BATCH_ACTIONS.items():
+        assert action is None or action in TextOnlyExecutor._ACTIONS, name
+        assert BatchActionTool._parse_step(FULL_STEPS[name]) is not None, name
@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("verl")
+
+from svagent.utils_mobile.control_tool_verl import _NESTED, _coerce_params, _parse_params
+
+
+def test_flat_arguments_hit_the_cache():
+    _parse_params.cache_clear()
+    text = '{"x": 1, "y": 2}'
+    assert _coerce_params(text) == {"x": 1, "y": 2}
+    assert _coerce_params(text) == {"x": 1, "y": 2}
+    assert _parse_params.cache_info().hits == 1
+
+
+def test_returned_dicts_are_not_shared():
+    text = '{"app": "Settings"}'
+    first = _coerce_params(text)
+    first["app"] = "Clock"
+    assert _coerce_params(text) == {"app": "Settings"}
+
+
+def test_nested_values_are_not_shared_between_calls():
+    text = '{"steps": [{"direction": "up"}], "options": {"quick": false}}'
+    assert _parse_params(text) is _NESTED
+    first = _coerce_params(text)
+    first["steps"].append({"direction": "down"})
+    first["steps"][0]["direction"] = "left"
+    first["options"]["quick"] = True
+    assert _coerce_params(text) == {"steps": [{"direction": "up"}], "options": {"quick": False}}
+
+
+def test_unparsable_or_non_dict_arguments():
+    assert _coerce_params("not json") == {}
+    assert _coerce_params("[1, 2]") == {}
+    assert _coerce_params(None) == {}
+    assert _coerce_params({"x": 1}) == {"x": 1}
@@ -0,0 +1,36 @@
+from svagent.utils_mobile.verifier_cache import VerifierCache
+
+
+MESSAGES = [
+    {"role": "system", "content": "verifier prompt"},
+    {"role": "user", "content": "task: open settings; claim: done; evidences: [1]"},
+]
+
+
+def test_make_key_is_stable_and_covers_model_and_messages():
+    key = VerifierCache.make_key("model-a", MESSAGES)
+    assert key == VerifierCache.make_key("model-a", [dict(m) for m in MESSAGES])
+    assert key != VerifierCache.make_key("model-b", MESSAGES)
+    assert key != VerifierCache.make_key("model-a", MESSAGES[:1])
+
+
+def test_put_get_stats_round_trip(tmp_path):
+    cache = VerifierCache(str(tmp_path / "cache" / "verdicts.db"))
+    key = VerifierCache.make_key("model-a", MESSAGES)
+
+    assert cache.get(key) is None
+    results = [(True, [1], "yes"), (False, [], "no")]
+    cache.put(key, "model-a", results)
+    assert cache.get(key) == results
+    assert cache.get(key) == results
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+
+def test_entries_are_shared_through_the_db_file(tmp_path):
+    db_path = str(tmp_path / "verdicts.db")
+    key = VerifierCache.make_key("model-a", MESSAGES)
+    VerifierCache(db_path).put(key, "model-a", [(True, [1], "yes")])
+
+    other = VerifierCache(db_path)
+    assert other.get(key) == [(True, [1], "yes")]
+    assert other.stats() == {"hits": 1, "misses": 0}